@@ -8,7 +8,12 @@ from django.http import HttpRequest
 from ninja.errors import HttpError
 from ninja_extra import status
 
+from core.decorators import (
+    Check,
+    resolve_object
+)
 import comment.models as models
+from post.models import Post
 
 
 def comment_exist(func):
@@ -17,9 +22,11 @@ def comment_exist(func):
             request: HttpRequest,
             comment_id: int, *args, **kwargs
     ) -> Any:
-        try:
-            models.Comment.objects.get(id=comment_id)
-        except models.Comment.DoesNotExist:
+        # Comments of a post awaiting moderation are as hidden as it
+        if not models.Comment.objects.filter(
+                id=comment_id,
+                post__in=Post.objects.visible_to(request.user)
+        ).exists():
             raise HttpError(
                 status.HTTP_404_NOT_FOUND,
                 "Comment not found"
@@ -28,37 +35,37 @@ def comment_exist(func):
     return wrapper
 
 
-def has_edit_access(func: Callable):
-    @wraps(func)
-    def wrapper(
-            request: HttpRequest,
-            comment_id: int, *args, **kwargs
-    ) -> Any:
-        comment = models.Comment.objects.get(id=comment_id)
-        if not comment.author == request.user:
-            raise HttpError(
-                status.HTTP_403_FORBIDDEN,
-                "You do not have permission to do edit this comment"
-            )
-        return func(request, comment_id, *args, **kwargs)
-    return wrapper
+def resolve_comment(
+        *select_related: str, check: Check | None = None
+) -> Callable:
+    """
+    Load the comment of the ``comment_id`` path parameter once, check
+    access to it and pass it to the view as ``comment``
+    """
+    return resolve_object(
+        models.Comment, "comment_id", "comment", "Comment not found",
+        select_related=select_related, check=check
+    )
 
 
-def has_delete_access(func: Callable):
-    @wraps(func)
-    def wrapper(
-            request: HttpRequest,
-            comment_id: int, *args, **kwargs
-    ) -> Any:
-        comment = models.Comment.objects.get(id=comment_id)
-        if not (
-                request.user.is_staff or
-                comment.author == request.user or
-                comment.post.author == request.user
-        ):
-            raise HttpError(
-                status.HTTP_403_FORBIDDEN,
-                "You do not have permission to delete this comment"
-            )
-        return func(request, comment_id, *args, **kwargs)
-    return wrapper
+def has_edit_access(request: HttpRequest, comment: models.Comment) -> None:
+    if not comment.author_id == request.user.id:
+        raise HttpError(
+            status.HTTP_403_FORBIDDEN,
+            "You do not have permission to do edit this comment"
+        )
+
+
+def has_delete_access(
+        request: HttpRequest, comment: models.Comment
+) -> None:
+    """Needs the comment loaded with its post"""
+    if not (
+            request.user.is_staff or
+            comment.author_id == request.user.id or
+            comment.post.author_id == request.user.id
+    ):
+        raise HttpError(
+            status.HTTP_403_FORBIDDEN,
+            "You do not have permission to delete this comment"
+        )
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0004_alter_comment_text"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="moderation_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("moderated", "Moderated")],
+                default="moderated",
+                max_length=16,
+            ),
+        ),
+    ]
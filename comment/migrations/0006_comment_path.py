@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0005_comment_moderation_status"),
+        ("post", "0009_post_moderation_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["path"], name="comment_path_idx", opclasses=["text_pattern_ops"]
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:04
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_stats(apps, schema_editor):
+    Comment = apps.get_model("comment", "Comment")
+    CommentDailyStats = apps.get_model("comment", "CommentDailyStats")
+    totals = (
+        Comment.objects.annotate(date=TruncDate("created_at"))
+        .values("date")
+        .annotate(
+            created_comments=Count("id"),
+            blocked_comments=Count("id", filter=Q(is_blocked=True)),
+        )
+        .order_by("date")
+    )
+    CommentDailyStats.objects.bulk_create(
+        [CommentDailyStats(**row) for row in totals], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0006_comment_path"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommentDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                ("created_comments", models.PositiveIntegerField(default=0)),
+                ("blocked_comments", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "comment daily stats",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.RunPython(fill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0008_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduledReply",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("due_at", models.DateTimeField()),
+                (
+                    "comment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scheduled_reply",
+                        to="comment.comment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "scheduled replies",
+                "ordering": ["due_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["due_at"], name="scheduled_reply_due_idx"
+                    )
+                ],
+            },
+        ),
+    ]
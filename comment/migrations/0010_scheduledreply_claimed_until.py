@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0009_scheduledreply"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduledreply",
+            name="claimed_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
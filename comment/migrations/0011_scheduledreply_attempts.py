@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0010_scheduledreply_claimed_until"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduledreply",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -1,9 +1,34 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
+from core.models import (
+    ModeratedQuerySet,
+    ModerationStatus
+)
 from post.models import Post
 
 User = get_user_model()
 
+# Width of one zero-padded id in a path, enough for any BigAutoField
+# value below 10**20, so paths sort and prefix-match like the tree.
+PATH_SEGMENT_WIDTH = 20
+
+
+def path_segment(comment_id: int) -> str:
+    return f"{comment_id:0{PATH_SEGMENT_WIDTH}d}/"
+
+
+class CommentQuerySet(ModeratedQuerySet):
+    def descendants_of(self, comment: "Comment") -> "CommentQuerySet":
+        """Every reply below the comment, at any depth"""
+        return self.filter(path__startswith=comment.children_path)
+
+    def subtree(self, comment: "Comment") -> "CommentQuerySet":
+        """The comment together with all of its replies"""
+        return self.filter(
+            Q(id=comment.id) | Q(path__startswith=comment.children_path)
+        )
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -19,9 +44,60 @@ class Comment(models.Model):
         on_delete=models.CASCADE, related_name="replies"
     )
     is_blocked = models.BooleanField(default=False)
+    moderation_status = models.CharField(
+        max_length=16,
+        choices=ModerationStatus.choices,
+        default=ModerationStatus.MODERATED
+    )
+    # Ids of the ancestors from the root down, see path_segment
+    path = models.TextField(default="", blank=True, editable=False)
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["path"], name="comment_path_idx",
+                opclasses=["text_pattern_ops"]
+            ),
+            # Comments of a post in feed order (loaders, counters)
+            models.Index(
+                fields=["post", "-created_at", "-id"],
+                name="comment_post_created_idx"
+            ),
+            # Top-level comments of a post, paged by get_comments_by_post
+            models.Index(
+                fields=["post", "-created_at", "-id"],
+                condition=Q(parent__isnull=True),
+                name="comment_root_idx"
+            ),
+            # Date range scans of the daily rollup, covering is_blocked
+            models.Index(
+                fields=["created_at", "is_blocked"],
+                name="comment_created_blocked_idx"
+            ),
+        ]
+
+    @property
+    def children_path(self) -> str:
+        return self.path + path_segment(self.id)
+
+    @property
+    def depth(self) -> int:
+        return len(self.path) // (PATH_SEGMENT_WIDTH + 1)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        comment = super().from_db(db, field_names, values)
+        # Lets signal handlers tell whether a save changed the verdict
+        comment.loaded_is_blocked = comment.__dict__.get("is_blocked")
+        return comment
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.parent_id is not None:
+            self.path = self.parent.children_path
+        super().save(*args, **kwargs)
 
     def __str__(self):
         if self.parent:
@@ -31,3 +107,47 @@ class Comment(models.Model):
         return (
             f"Comment by {self.author} with text {self.text}"
         )
+
+
+class CommentDailyStats(models.Model):
+    """
+    Comments created and blocked per day (in TIME_ZONE), maintained by
+    comment.signals and rebuilt by backfill_comment_daily_stats.
+    """
+
+    date = models.DateField(unique=True)
+    created_comments = models.PositiveIntegerField(default=0)
+    blocked_comments = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name_plural = "comment daily stats"
+
+    def __str__(self):
+        return f"Comment stats for {self.date}"
+
+
+class ScheduledReply(models.Model):
+    """
+    An auto-reply owed to a comment once its post's reply_time has
+    passed, sent by integrations.tasks.send_due_replies.
+    """
+
+    comment = models.OneToOneField(
+        Comment, on_delete=models.CASCADE, related_name="scheduled_reply"
+    )
+    due_at = models.DateTimeField()
+    # End of the lease of the sweep sending the reply
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    # Sweeps that got no reply from the backend
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ["due_at"]
+        verbose_name_plural = "scheduled replies"
+        indexes = [
+            models.Index(fields=["due_at"], name="scheduled_reply_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"Reply to comment {self.comment_id} at {self.due_at}"
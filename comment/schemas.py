@@ -2,13 +2,17 @@ from datetime import (
     datetime,
     date
 )
-from typing import Optional
-from django.db.models import QuerySet
+from typing import (
+    Collection,
+    Iterable,
+    Optional
+)
 from ninja import (
     Schema,
     Field
 )
 from comment.models import Comment
+from social_service.settings import COMMENT_BULK_MAX_SIZE
 from user.schemas import UserSchema
 
 
@@ -21,25 +25,57 @@ class CommentSchema(BaseCommentSchema):
     author: UserSchema
     created_at: datetime
     is_blocked: bool
+    moderation_status: str
     replies: list["CommentSchema"] = []
 
+    @staticmethod
+    def resolve_replies(comment) -> list:
+        if isinstance(comment, Comment):
+            # Replies are attached by build_comment_hierarchy from
+            # rows loaded up front, never fetched comment by comment
+            return []
+        if isinstance(comment, dict):
+            return comment["replies"]
+        return comment.replies
+
     @staticmethod
     def build_comment_hierarchy(
-            comments: QuerySet[Comment]
-    ) -> list["CommentSchema"]:
-        comment_map = {
-            comment.id: CommentSchema.from_orm(comment)
-            for comment in comments
-        }
-        root_comments = []
+            rows: Iterable[dict], root_ids: Collection[int] = ()
+    ) -> list[dict]:
+        """
+        Nest comment rows (see comment.tree) into plain dicts shaped
+        like CommentSchema, in one pass over the rows. Top-level
+        comments and ``root_ids`` become roots; replies whose parent is
+        missing are hidden from the reader, so are dropped.
+        """
+        nodes = {}
+        parents = []
+        for row in rows:
+            nodes[row["id"]] = {
+                "id": row["id"],
+                "text": row["text"],
+                "author": {
+                    "id": row["author_id"],
+                    "username": row["author__username"],
+                    "is_staff": row["author__is_staff"],
+                },
+                "created_at": row["created_at"],
+                "is_blocked": row["is_blocked"],
+                "moderation_status": row["moderation_status"],
+                "replies": [],
+            }
+            parents.append(
+                None if row["id"] in root_ids else row["parent_id"]
+            )
 
-        for comment in comments:
-            if comment.parent is None:
-                root_comments.append(comment_map[comment.id])
-            else:
-                parent_comment = comment_map[comment.parent.id]
-                if comment_map[comment.id] not in parent_comment.replies:
-                    parent_comment.replies.append(comment_map[comment.id])
+        root_comments = []
+        for node, parent_id in zip(nodes.values(), parents):
+            if parent_id is None:
+                root_comments.append(node)
+                continue
+            parent = nodes.get(parent_id)
+            if parent is not None:
+                parent["replies"].append(node)
 
         return root_comments
 
@@ -48,6 +84,18 @@ class CreateCommentSchema(BaseCommentSchema):
     parent_id: Optional[int] = None
 
 
+class BulkCommentSchema(CreateCommentSchema):
+    # Position of the parent among the comments of the same request,
+    # for replies to comments that do not exist yet
+    parent_index: Optional[int] = None
+
+
+class BulkCreateCommentSchema(Schema):
+    comments: list[BulkCommentSchema] = Field(
+        min_length=1, max_length=COMMENT_BULK_MAX_SIZE
+    )
+
+
 class UpdateCommentSchema(BaseCommentSchema):
     pass
 
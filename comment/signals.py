@@ -0,0 +1,189 @@
+from collections import defaultdict
+
+from django.db.models import (
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value
+)
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+    TruncDate
+)
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from comment.models import Comment
+from comment.stats import add_daily_stats
+from core.cache import (
+    FEED_SCOPE,
+    POST_SCOPE,
+    invalidate
+)
+from post.models import Post
+
+
+def count_created_comments(post_id: int, comments: list[Comment]) -> None:
+    """
+    Add new comments of a post to its counters and to the daily stats.
+    Called for every saved comment, bulk inserts (which send no
+    signals) call it themselves.
+    """
+    blocked = sum(comment.is_blocked for comment in comments)
+    latest = max(comment.created_at for comment in comments)
+    Post.objects.filter(id=post_id).update(
+        updated_at=timezone.now(),
+        comment_count=F("comment_count") + len(comments),
+        blocked_comment_count=F("blocked_comment_count") + blocked,
+        last_comment_at=Greatest(
+            Coalesce("last_comment_at", Value(latest)), Value(latest)
+        )
+    )
+    days = defaultdict(lambda: [0, 0])
+    for comment in comments:
+        day = days[timezone.localdate(comment.created_at)]
+        day[0] += 1
+        day[1] += int(comment.is_blocked)
+    for day, (created, blocked) in days.items():
+        add_daily_stats(day, created, blocked)
+
+
+def count_remoderated_comments(comments: list[Comment]) -> None:
+    """
+    Apply new verdicts of comments updated in bulk (which send no
+    signals) to the post counters, the daily stats and the response
+    cache, like count_saved_comment does for a single save.
+    """
+    posts = defaultdict(int)
+    days = defaultdict(int)
+    for comment in comments:
+        change = int(comment.is_blocked) - int(comment.loaded_is_blocked)
+        posts[comment.post_id] += change
+        days[timezone.localdate(comment.created_at)] += change
+        comment.loaded_is_blocked = comment.is_blocked
+
+    # Also posts whose comments only left the pending state, their
+    # readers see more comments now
+    by_change = defaultdict(list)
+    for post_id, change in posts.items():
+        by_change[change].append(post_id)
+    for change, post_ids in by_change.items():
+        Post.objects.filter(id__in=post_ids).update(
+            updated_at=timezone.now(),
+            blocked_comment_count=Greatest(
+                F("blocked_comment_count") + change, 0
+            )
+        )
+    for day, change in days.items():
+        if change:
+            add_daily_stats(day, 0, change)
+    invalidate(FEED_SCOPE, *(
+        POST_SCOPE.format(post_id=post_id) for post_id in posts
+    ))
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(
+        sender, instance: Comment, created: bool, **kwargs
+) -> None:
+    if created:
+        count_created_comments(instance.post_id, [instance])
+        instance.loaded_is_blocked = instance.is_blocked
+        return
+
+    # Any change to a comment moves the post's updated_at, the version
+    # conditional reads of the post are checked against
+    changes = {"updated_at": timezone.now()}
+    if instance.is_blocked != getattr(
+            instance, "loaded_is_blocked", instance.is_blocked
+    ):
+        change = 1 if instance.is_blocked else -1
+        changes["blocked_comment_count"] = Greatest(
+            F("blocked_comment_count") + change, 0
+        )
+        add_daily_stats(
+            timezone.localdate(instance.created_at), 0, change
+        )
+    Post.objects.filter(id=instance.post_id).update(**changes)
+    instance.loaded_is_blocked = instance.is_blocked
+
+
+def deleted_with_post(instance: Comment, origin) -> bool:
+    """
+    Whether the comment goes away in the same delete as its post, be it
+    of the post, of a queryset of posts or of the post's author
+    """
+    return instance.post_id in getattr(origin, "uncounted_post_ids", ())
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(
+        sender, instance: Comment, origin=None, **kwargs
+) -> None:
+    if deleted_with_post(instance, origin):
+        # Handled in bulk by uncount_post_comments
+        return
+    # Clamped so drift left for reconcile_post_counters cannot fail
+    # the delete on the unsigned columns
+    Post.objects.filter(id=instance.post_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        blocked_comment_count=Greatest(
+            F("blocked_comment_count") - int(instance.is_blocked), 0
+        ),
+        last_comment_at=Subquery(
+            Comment.objects.filter(post_id=OuterRef("id"))
+            .order_by("-created_at")
+            .values("created_at")[:1]
+        ),
+        updated_at=timezone.now()
+    )
+    add_daily_stats(
+        timezone.localdate(instance.created_at),
+        -1, -int(instance.is_blocked)
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_reads(
+        sender, instance: Comment, origin=None, **kwargs
+) -> None:
+    if deleted_with_post(instance, origin):
+        # The post's own delete retires the same responses
+        return
+    invalidate(FEED_SCOPE, POST_SCOPE.format(post_id=instance.post_id))
+
+
+@receiver(pre_delete, sender=Post)
+def uncount_post_comments(
+        sender, instance: Post, origin=None, **kwargs
+) -> None:
+    """
+    Take the comments of a deleted post out of the daily stats, the
+    post is noted on the delete's origin so count_deleted_comment skips
+    them
+    """
+    if origin is not None:
+        if not hasattr(origin, "uncounted_post_ids"):
+            origin.uncounted_post_ids = set()
+        origin.uncounted_post_ids.add(instance.id)
+    days = (
+        Comment.objects.filter(post=instance)
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            created=Count("id"),
+            blocked=Count("id", filter=Q(is_blocked=True))
+        )
+        .order_by()
+    )
+    for day in days:
+        add_daily_stats(day["day"], -day["created"], -day["blocked"])
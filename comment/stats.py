@@ -0,0 +1,89 @@
+from datetime import (
+    date,
+    datetime,
+    time,
+    timedelta
+)
+
+from django.db import transaction
+from django.db.models import (
+    Count,
+    F,
+    Q,
+    QuerySet
+)
+from django.db.models.functions import (
+    Greatest,
+    TruncDate
+)
+from django.utils import timezone
+
+from comment.models import (
+    Comment,
+    CommentDailyStats
+)
+
+
+def aggregate_daily_comments(
+        date_from: date | None = None, date_to: date | None = None
+) -> QuerySet:
+    """Count created and blocked comments per day straight from Comment"""
+    # A half-open range on the raw column keeps the filter sargable,
+    # unlike created_at__date which casts every row before comparing
+    comments = Comment.objects.all()
+    if date_from is not None:
+        comments = comments.filter(created_at__gte=start_of_day(date_from))
+    if date_to is not None:
+        comments = comments.filter(
+            created_at__lt=start_of_day(date_to + timedelta(days=1))
+        )
+    return (
+        comments
+        .annotate(date=TruncDate("created_at"))
+        .values("date")
+        .annotate(
+            created_comments=Count("id"),
+            blocked_comments=Count("id", filter=Q(is_blocked=True))
+        )
+        .order_by("date")
+    )
+
+
+def start_of_day(day: date) -> datetime:
+    """Midnight of the day in the current time zone"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def add_daily_stats(day: date, created: int, blocked: int) -> None:
+    """Shift the counters of one day, creating its row when needed"""
+    if created > 0 or blocked > 0:
+        CommentDailyStats.objects.bulk_create(
+            [CommentDailyStats(date=day)], ignore_conflicts=True
+        )
+    CommentDailyStats.objects.filter(date=day).update(
+        created_comments=Greatest(F("created_comments") + created, 0),
+        blocked_comments=Greatest(F("blocked_comments") + blocked, 0)
+    )
+
+
+def rebuild_daily_stats(
+        date_from: date | None = None, date_to: date | None = None,
+        batch_size: int = 1000
+) -> int:
+    """Replace the rollup rows of the range with fresh aggregates"""
+    stale = CommentDailyStats.objects.all()
+    if date_from is not None:
+        stale = stale.filter(date__gte=date_from)
+    if date_to is not None:
+        stale = stale.filter(date__lte=date_to)
+
+    with transaction.atomic():
+        stale.delete()
+        rows = CommentDailyStats.objects.bulk_create(
+            [
+                CommentDailyStats(**totals)
+                for totals in aggregate_daily_comments(date_from, date_to)
+            ],
+            batch_size=batch_size
+        )
+    return len(rows)
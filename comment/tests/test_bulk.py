@@ -0,0 +1,156 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ninja_jwt.tokens import AccessToken
+
+from comment.models import (
+    Comment,
+    CommentDailyStats,
+    ScheduledReply
+)
+from core.tests.utils import blocked_when_marked
+from post.models import Post
+from social_service.settings import COMMENT_BULK_MAX_SIZE
+
+User = get_user_model()
+
+
+@mock.patch(
+    "comment.views.block_decisions", side_effect=blocked_when_marked
+)
+class BulkCreateCommentTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.other_user = User.objects.create_user(
+            username="otheruser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="Test Content",
+            reply_on_comments=False
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.user, text="Root Comment"
+        )
+        self.url = f"/api/comments/create/{self.post.id}/bulk"
+        access = AccessToken.for_user(self.other_user)
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {access}"
+
+    def create(self, comments):
+        return self.client.post(
+            self.url, {"comments": comments},
+            content_type="application/json"
+        )
+
+    def test_creates_batch_with_replies(self, block_decisions):
+        response = self.create([
+            {"text": "First new comment"},
+            {"text": "Reply to the first", "parent_index": 0},
+            {"text": "Reply to the reply, blocked", "parent_index": 1},
+            {"text": "Reply to an existing one", "parent_id": self.comment.id},
+        ])
+        self.assertEqual(response.status_code, 200)
+        block_decisions.assert_called_once()
+        self.assertEqual(
+            [comment["text"] for comment in response.json()], [
+                "First new comment",
+                "Reply to the first",
+                "Reply to the reply, blocked",
+                "Reply to an existing one",
+            ]
+        )
+        self.assertEqual(
+            [comment["is_blocked"] for comment in response.json()],
+            [False, False, True, False]
+        )
+
+        ids = [comment["id"] for comment in response.json()]
+        first, reply, nested, existing = (
+            Comment.objects.get(id=comment_id) for comment_id in ids
+        )
+        self.assertIsNone(first.parent_id)
+        self.assertEqual(reply.parent_id, first.id)
+        self.assertEqual(nested.parent_id, reply.id)
+        self.assertEqual(nested.depth, 2)
+        self.assertEqual(
+            list(Comment.objects.descendants_of(first).order_by("id")),
+            [reply, nested]
+        )
+        self.assertEqual(existing.parent_id, self.comment.id)
+
+    def test_updates_counters_and_daily_stats(self, block_decisions):
+        self.create([
+            {"text": "First new comment"},
+            {"text": "Second one, blocked"},
+        ])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 3)
+        self.assertEqual(self.post.blocked_comment_count, 1)
+        stats = CommentDailyStats.objects.get(date=timezone.localdate())
+        self.assertEqual(stats.created_comments, 3)
+        self.assertEqual(stats.blocked_comments, 1)
+
+    def test_query_count_does_not_grow_with_batch(self, block_decisions):
+        counts = []
+        for size in (2, 20):
+            with CaptureQueriesContext(connection) as queries:
+                self.create([
+                    {"text": f"Bulk comment {number}"}
+                    for number in range(size)
+                ])
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_schedules_replies(self, block_decisions):
+        self.post.reply_on_comments = True
+        self.post.save()
+        response = self.create([
+            {"text": "First new comment"},
+            {"text": "Second new comment"},
+        ])
+        scheduled = ScheduledReply.objects.order_by("comment_id")
+        self.assertEqual(
+            [reply.comment_id for reply in scheduled],
+            [comment["id"] for comment in response.json()]
+        )
+        self.assertLessEqual(
+            scheduled[0].due_at, timezone.now() + self.post.reply_time
+        )
+
+    def test_rejects_invalid_parents(self, block_decisions):
+        other_post = Post.objects.create(
+            author=self.user, title="Other Post", text="Other Content"
+        )
+        foreign = Comment.objects.create(
+            post=other_post, author=self.user, text="Foreign Comment"
+        )
+        cases = [
+            [{"text": "Points forward", "parent_index": 0}],
+            [
+                {"text": "First new comment"},
+                {
+                    "text": "Both parents",
+                    "parent_index": 0,
+                    "parent_id": self.comment.id,
+                },
+            ],
+            [{"text": "Missing parent", "parent_id": 999}],
+            [{"text": "Foreign parent", "parent_id": foreign.id}],
+        ]
+        for comments in cases:
+            with self.subTest(comments=comments):
+                response = self.create(comments)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), 1)
+
+    def test_rejects_oversized_batch(self, block_decisions):
+        response = self.create([
+            {"text": f"Bulk comment {number}"}
+            for number in range(COMMENT_BULK_MAX_SIZE + 1)
+        ])
+        self.assertEqual(response.status_code, 422)
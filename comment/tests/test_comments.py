@@ -1,9 +1,12 @@
+from unittest import mock
+
 from django.test import (
     TestCase,
     Client
 )
 from ninja_jwt.tokens import AccessToken
 import comment.models as models
+from core.models import ModerationStatus
 from post.models import Post
 from django.contrib.auth import get_user_model
 
@@ -64,6 +67,29 @@ class CommentAPITestCase(TestCase):
         self.comment.refresh_from_db()
         self.assertEqual(self.comment.text, "Updated Comment")
 
+    @mock.patch("comment.views.ablock_decision", return_value=True)
+    def test_edit_comment_is_moderated(self, ablock_decision):
+        self.authenticate()
+        response = self.client.patch(
+            f"/api/comments/{self.comment.id}",
+            {"text": "Updated Comment"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_blocked"])
+        ablock_decision.assert_awaited_once_with("Updated Comment")
+
+    def test_create_reply_to_comment_of_other_post(self):
+        other_post = Post.objects.create(
+            title="Other Post", text="Other Content", author=self.user
+        )
+        self.authenticate()
+        response = self.client.post(
+            f"/api/comments/create/{other_post.id}",
+            {"text": "New Reply", "parent_id": self.comment.id},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
     def test_edit_comment_no_permission(self):
         self.authenticate(self.admin_user)
         payload = {"text": "Updated Comment"}
@@ -114,3 +140,60 @@ class CommentAPITestCase(TestCase):
             f"/api/comments/{self.comment.id}"
         )
         self.assertEqual(response.status_code, 200)
+
+    @mock.patch("comment.views.ASYNC_MODERATION", True)
+    @mock.patch("comment.views.moderate_comment")
+    @mock.patch("comment.views.ablock_decision")
+    def test_create_comment_with_async_moderation(
+            self, ablock_decision, moderate_comment
+    ):
+        self.authenticate()
+        response = self.client.post(
+            f"/api/comments/create/{self.post.id}",
+            {"text": "New Comment"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["moderation_status"], "pending")
+        ablock_decision.assert_not_called()
+        moderate_comment.delay.assert_called_once_with(response.json()["id"])
+
+    def test_pending_post_comments_only_for_its_author(self):
+        self.post.moderation_status = ModerationStatus.PENDING
+        self.post.save()
+        list_url = f"/api/comments/post/{self.post.id}"
+        create_url = f"/api/comments/create/{self.post.id}"
+        payload = {"text": "New Comment"}
+
+        self.assertEqual(self.client.get(list_url).status_code, 404)
+        self.authenticate(self.admin_user)
+        self.assertEqual(self.client.get(list_url).status_code, 404)
+        response = self.client.post(
+            create_url, payload, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            f"{create_url}/bulk", {"comments": [payload]},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 404)
+
+        self.authenticate()
+        self.assertEqual(self.client.get(list_url).status_code, 200)
+        response = self.client.post(
+            create_url, payload, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_pending_comment_visible_only_to_author(self):
+        models.Comment.objects.create(
+            post=self.post, author=self.admin_user, text="Pending Comment",
+            moderation_status=ModerationStatus.PENDING
+        )
+        url = f"/api/comments/post/{self.post.id}"
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()["count"], 1)
+
+        self.authenticate(self.admin_user)
+        response = self.client.get(url)
+        self.assertEqual(response.json()["count"], 2)
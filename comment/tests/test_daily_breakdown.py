@@ -1,11 +1,22 @@
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import (
     TestCase,
     Client
 )
+from django.utils import timezone
 from ninja_jwt.tokens import AccessToken
 from django.contrib.auth import get_user_model
 
+from comment.models import (
+    Comment,
+    CommentDailyStats
+)
+from comment.stats import aggregate_daily_comments
+from post.models import Post
+
 User = get_user_model()
 
 
@@ -47,3 +58,91 @@ class DailyBreakdownTestCase(TestCase):
             f"?date_from={date_from}&date_to={date_to}"
         )
         self.assertEqual(response.status_code, 422)
+
+
+class CommentDailyStatsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            title="Test Post", text="Test Content", author=self.user
+        )
+        self.today = timezone.localdate()
+
+    def breakdown(self):
+        response = Client().get(
+            "/api/comments/daily-breakdown/",
+            {"date_from": self.today, "date_to": self.today}
+        )
+        return [
+            (item["created_comments"], item["blocked_comments"])
+            for item in response.json()["items"]
+        ]
+
+    def create_comment(self, **kwargs):
+        return Comment.objects.create(
+            post=self.post, author=self.user, text="Test Comment", **kwargs
+        )
+
+    def test_rollup_follows_comments(self):
+        comment = self.create_comment()
+        self.create_comment(is_blocked=True)
+        self.assertEqual(self.breakdown(), [(2, 1)])
+
+        comment.is_blocked = True
+        comment.save()
+        self.assertEqual(self.breakdown(), [(2, 2)])
+
+        comment.delete()
+        self.assertEqual(self.breakdown(), [(1, 1)])
+
+        self.post.delete()
+        self.assertEqual(self.breakdown(), [])
+
+    def test_user_delete_counts_comments_once(self):
+        other_user = User.objects.create_user(
+            username="otheruser", password="password"
+        )
+        other_post = Post.objects.create(
+            title="Other Post", text="Other Content", author=other_user
+        )
+        # Comments on the user's post go with it, so does the user's
+        # comment on the other post
+        Comment.objects.create(
+            post=self.post, author=other_user, text="Test Comment"
+        )
+        self.create_comment(is_blocked=True)
+        Comment.objects.create(
+            post=other_post, author=self.user, text="Test Comment"
+        )
+        Comment.objects.create(
+            post=other_post, author=other_user, text="Test Comment"
+        )
+        self.assertEqual(self.breakdown(), [(4, 1)])
+
+        self.user.delete()
+        self.assertEqual(self.breakdown(), [(1, 0)])
+        other_post.refresh_from_db()
+        self.assertEqual(other_post.comment_count, 1)
+
+    def test_backfill_comment_daily_stats(self):
+        self.create_comment(is_blocked=True)
+        CommentDailyStats.objects.update(created_comments=5)
+        call_command("backfill_comment_daily_stats", stdout=StringIO())
+        self.assertEqual(self.breakdown(), [(1, 1)])
+
+    def test_aggregate_uses_local_day_boundaries(self):
+        day = date(2024, 3, 10)
+        for created_at in (
+                datetime.combine(day, time(0, 0)),
+                datetime.combine(day, time(23, 59)),
+                datetime.combine(day + timedelta(days=1), time(0, 0)),
+        ):
+            comment = self.create_comment()
+            comment.created_at = timezone.make_aware(created_at)
+            comment.save(update_fields=["created_at"])
+        self.assertEqual(
+            list(aggregate_daily_comments(day, day)),
+            [{"date": day, "created_comments": 2, "blocked_comments": 0}]
+        )
@@ -0,0 +1,84 @@
+from datetime import date
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from comment.models import Comment
+from comment.stats import aggregate_daily_comments
+from post.models import Post
+
+User = get_user_model()
+
+
+@skipUnless(
+    connection.vendor in ("sqlite", "postgresql"),
+    "EXPLAIN output is backend specific"
+)
+class QueryPlanTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        posts = Post.objects.bulk_create([
+            Post(author=user, title=f"Post {number}", text="Content")
+            for number in range(20)
+        ])
+        Comment.objects.bulk_create([
+            Comment(post=post, author=user, text=f"Comment {number}")
+            for post in posts for number in range(20)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.post = posts[0]
+
+    def assertUsesIndex(self, queryset, index):
+        if connection.vendor == "postgresql":
+            # Tiny test tables are cheaper to scan than to probe
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertIn(index, plan)
+        return plan
+
+    def test_breakdown_range_seeks_index(self):
+        plan = self.assertUsesIndex(
+            aggregate_daily_comments(date(2024, 1, 1), date(2024, 12, 31)),
+            "comment_created_blocked_idx"
+        )
+        if connection.vendor == "sqlite":
+            self.assertIn("SEARCH", plan)
+        else:
+            self.assertIn("Index Cond", plan)
+
+    def test_date_cast_cannot_seek_index(self):
+        casted = Comment.objects.filter(
+            created_at__date__range=(date(2024, 1, 1), date(2024, 12, 31))
+        ).values("is_blocked")
+        plan = casted.explain()
+        if connection.vendor == "sqlite":
+            self.assertNotIn("SEARCH", plan)
+        else:
+            self.assertNotIn("Index Cond", plan)
+
+    def test_post_comments_use_index(self):
+        self.assertUsesIndex(
+            Comment.objects.filter(post=self.post)
+            .order_by("-created_at", "-id"),
+            "comment_post_created_idx"
+        )
+
+    def test_top_level_comments_use_partial_index(self):
+        self.assertUsesIndex(
+            Comment.objects.filter(post=self.post, parent__isnull=True)
+            .order_by("-created_at", "-id"),
+            "comment_root_idx"
+        )
+
+    def test_feed_uses_index(self):
+        self.assertUsesIndex(
+            Post.objects.order_by("-created_at", "-id")[:5],
+            "post_feed_idx"
+        )
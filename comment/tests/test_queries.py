@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from ninja_jwt.tokens import AccessToken
+
+from comment.models import Comment
+from post.models import Post
+
+User = get_user_model()
+
+
+@mock.patch("comment.views.ablock_decision", return_value=False)
+class CommentQueryCountTestCase(TestCase):
+    """Each access check reuses the comment the view works on"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="Test Content",
+            reply_on_comments=False
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.user, text="Root Comment"
+        )
+        access = AccessToken.for_user(self.user)
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {access}"
+
+    def test_create_comment(self, block_decision):
+        # User, post, insert, then the counters: daily stats row and
+        # its update, post update
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                f"/api/comments/create/{self.post.id}",
+                {"text": "New Comment"}, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_create_reply(self, block_decision):
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                f"/api/comments/create/{self.post.id}",
+                {"text": "New Reply", "parent_id": self.comment.id},
+                content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_edit_comment(self, block_decision):
+        # User, comment with its author, update, post version update
+        with self.assertNumQueries(4):
+            response = self.client.patch(
+                f"/api/comments/{self.comment.id}",
+                {"text": "Updated Comment"}, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["author"]["id"], self.user.id)
+
+    def test_delete_comment(self, block_decision):
+        # User, comment with its post, the subtree, replies of the
+        # subtree, their scheduled replies, delete, then post counters
+        # and daily stats
+        with self.assertNumQueries(8):
+            response = self.client.delete(f"/api/comments/{self.comment.id}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete_by_post_author(self, block_decision):
+        other_user = User.objects.create_user(
+            username="otheruser", password="password"
+        )
+        comment = Comment.objects.create(
+            post=self.post, author=other_user, text="Other Comment"
+        )
+        with self.assertNumQueries(8):
+            response = self.client.delete(f"/api/comments/{comment.id}")
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,147 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import (
+    TestCase,
+    Client
+)
+from ninja_jwt.tokens import AccessToken
+
+from comment.models import Comment
+from comment.schemas import CommentSchema
+from comment.tree import load_comment_rows
+from core.models import ModerationStatus
+from post.models import Post
+
+User = get_user_model()
+
+
+class CommentTreeTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.other_user = User.objects.create_user(
+            username="otheruser", password="password"
+        )
+        self.post = Post.objects.create(
+            title="Test Post", text="Test Content", author=self.user
+        )
+        self.root = self.create_comment("Root Comment")
+        self.reply = self.create_comment("Reply Comment", parent=self.root)
+        self.nested_reply = self.create_comment(
+            "Nested Reply", parent=self.reply
+        )
+        self.pending = self.create_comment(
+            "Pending Reply", parent=self.root, author=self.other_user,
+            moderation_status=ModerationStatus.PENDING
+        )
+        self.hidden_reply = self.create_comment(
+            "Reply To Pending", parent=self.pending
+        )
+
+    def create_comment(self, text, parent=None, author=None, **kwargs):
+        return Comment.objects.create(
+            post=self.post, author=author or self.user, text=text,
+            parent=parent, **kwargs
+        )
+
+    def test_loads_thread_with_depth_and_path(self):
+        with self.assertNumQueries(1):
+            rows = load_comment_rows(AnonymousUser(), post_id=self.post.id)
+        by_id = {row["id"]: row for row in rows}
+
+        self.assertEqual(
+            set(by_id), {self.root.id, self.reply.id, self.nested_reply.id}
+        )
+        nested = by_id[self.nested_reply.id]
+        self.assertEqual(nested["author__username"], "testuser")
+        self.assertEqual(nested["created_at"], self.nested_reply.created_at)
+        self.assertIs(nested["is_blocked"], False)
+        self.assertEqual(nested["depth"], 2)
+        self.assertEqual(
+            nested["path"].split("/")[:-1],
+            [str(self.root.id).zfill(20), str(self.reply.id).zfill(20)]
+        )
+        self.assertEqual(nested["path"], self.nested_reply.path)
+
+    def test_pending_subtree_is_visible_to_its_author(self):
+        rows = load_comment_rows(self.other_user, post_id=self.post.id)
+        self.assertIn(self.pending.id, {row["id"] for row in rows})
+
+    def test_loads_subtree(self):
+        rows = load_comment_rows(self.user, root_ids=[self.reply.id])
+        self.assertEqual(
+            {row["id"]: row["depth"] for row in rows},
+            {self.reply.id: 0, self.nested_reply.id: 1}
+        )
+
+    def test_builds_hierarchy(self):
+        rows = load_comment_rows(self.user, post_id=self.post.id)
+        tree = CommentSchema.build_comment_hierarchy(rows)
+        self.assertEqual([node["id"] for node in tree], [self.root.id])
+        self.assertEqual(
+            [node["id"] for node in tree[0]["replies"]], [self.reply.id]
+        )
+        self.assertEqual(
+            tree[0]["replies"][0]["replies"][0]["author"]["username"],
+            "testuser"
+        )
+
+    def test_replies_of_hidden_comments_are_dropped(self):
+        rows = load_comment_rows(self.user, post_id=self.post.id)
+        rows.append({
+            **rows[0], "id": 0, "parent_id": self.hidden_reply.id
+        })
+        tree = CommentSchema.build_comment_hierarchy(rows)
+        ids = {node["id"] for node in tree[0]["replies"]}
+        self.assertEqual(ids, {self.reply.id})
+
+    def test_path_is_filled_on_insert(self):
+        self.assertEqual(self.root.path, "")
+        self.assertEqual(self.nested_reply.depth, 2)
+        self.assertEqual(
+            set(Comment.objects.descendants_of(self.root)),
+            {self.reply, self.nested_reply, self.pending, self.hidden_reply}
+        )
+        self.assertEqual(
+            set(Comment.objects.subtree(self.reply)),
+            {self.reply, self.nested_reply}
+        )
+
+    def test_backfill_comment_paths(self):
+        Comment.objects.update(path="")
+        call_command(
+            "backfill_comment_paths", chunk_size=2, stdout=StringIO()
+        )
+        self.nested_reply.refresh_from_db()
+        self.assertEqual(
+            self.nested_reply.path, self.reply.children_path
+        )
+
+    def test_comment_thread_endpoint(self):
+        response = Client().get(f"/api/comments/{self.root.id}/thread")
+        self.assertEqual(response.status_code, 200)
+        thread = response.json()
+        self.assertEqual(thread["id"], self.root.id)
+        self.assertEqual(
+            [reply["id"] for reply in thread["replies"]], [self.reply.id]
+        )
+        self.assertEqual(
+            thread["replies"][0]["replies"][0]["id"], self.nested_reply.id
+        )
+
+    def test_comment_thread_of_pending_post(self):
+        self.post.moderation_status = ModerationStatus.PENDING
+        self.post.save()
+        url = f"/api/comments/{self.root.id}/thread"
+
+        self.assertEqual(Client().get(url).status_code, 404)
+        for user, status_code in ((self.other_user, 404), (self.user, 200)):
+            access = AccessToken.for_user(user)
+            response = Client().get(
+                url, HTTP_AUTHORIZATION=f"Bearer {access}"
+            )
+            self.assertEqual(response.status_code, status_code)
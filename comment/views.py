@@ -1,83 +1,148 @@
 from datetime import date
 
-from django.db.models import Count, Q
-from django.db.models.functions import TruncDate
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import QuerySet
 from django.http import HttpRequest
+from django.utils import timezone
 from ninja import Router, Query
+from ninja.decorators import decorate_view
 from ninja.errors import HttpError
-from ninja.pagination import (
-    PageNumberPagination,
-    paginate
-)
 from ninja.responses import Response
 from ninja_extra import status
-from ninja_jwt.authentication import JWTAuth
 
-from integrations.gemini import block_decision
-from integrations.tasks import auto_reply_to_comment
-from comment.models import Comment
+from core.cache import (
+    FEED_SCOPE,
+    POST_SCOPE,
+    cached_response,
+    invalidate
+)
+from core.models import ModerationStatus
+from core.pagination import list_pagination
+from integrations.moderation import (
+    ablock_decision,
+    block_decisions
+)
+from integrations.tasks import (
+    moderate_comment,
+    reply_due_at
+)
+from comment.models import (
+    Comment,
+    CommentDailyStats,
+    ScheduledReply
+)
 from comment.decorators import (
     comment_exist,
     has_delete_access,
-    has_edit_access
+    has_edit_access,
+    resolve_comment
 )
 import comment.schemas as schemas
-from post.decorators import post_exist
+from comment.signals import count_created_comments
+from comment.tree import load_comment_rows
+from post.conditional import conditional_post_read
+from post.decorators import (
+    post_exist,
+    resolve_post
+)
+from post.models import Post
 from social_service.settings import (
+    ASYNC_MODERATION,
     PAGE_PAGINATION_NUMBER,
     BREAKDOWN_PAGINATION_NUMBER
 )
+from user.authentication import (
+    AsyncStatelessJWTAuth,
+    OptionalJWTAuth,
+    StatelessJWTAuth
+)
 
 router = Router()
 
 
+def with_replies(
+        request: HttpRequest, comments: list[Comment]
+) -> list[dict]:
+    """Load the visible reply trees of a page of top-level comments"""
+    root_ids = [comment.id for comment in comments]
+    return schemas.CommentSchema.build_comment_hierarchy(
+        load_comment_rows(request.user, root_ids=root_ids), root_ids
+    )
+
+
 @router.get(
     "/post/{post_id}",
-    response={200: list[schemas.CommentSchema], 404: str}
+    response={200: list[schemas.CommentSchema], 404: str},
+    auth=OptionalJWTAuth()
 )
-@paginate(PageNumberPagination, page_size=PAGE_PAGINATION_NUMBER)
+@decorate_view(conditional_post_read)
+@decorate_view(cached_response(POST_SCOPE))
+@list_pagination(PAGE_PAGINATION_NUMBER, hydrate=with_replies)
 @post_exist
 def get_comments_by_post(
         request: HttpRequest, post_id: int
-) -> list[schemas.CommentSchema]:
+) -> QuerySet[Comment]:
     comments = Comment.objects.filter(
-        post_id=post_id
-    ).select_related("author").prefetch_related("replies")
+        post_id=post_id, parent__isnull=True
+    ).visible_to(request.user).order_by("-created_at", "-id")
     if not comments.exists():
         raise HttpError(
             status.HTTP_404_NOT_FOUND,
             "Comments not found"
         )
-    return schemas.CommentSchema.build_comment_hierarchy(comments)
+    return comments
+
+
+@router.get(
+    "/{comment_id}/thread",
+    response={200: schemas.CommentSchema, 404: str},
+    auth=OptionalJWTAuth()
+)
+@comment_exist
+def get_comment_thread(
+        request: HttpRequest, comment_id: int
+) -> dict:
+    rows = load_comment_rows(request.user, root_ids=[comment_id])
+    if not rows:
+        raise HttpError(
+            status.HTTP_404_NOT_FOUND,
+            "Comment not found"
+        )
+    return schemas.CommentSchema.build_comment_hierarchy(
+        rows, [comment_id]
+    )[0]
 
 
 @router.patch(
     "/{comment_id}",
-    response={200: schemas.CommentSchema, 400: str, 404: str}, auth=JWTAuth()
+    response={200: schemas.CommentSchema, 400: str, 404: str},
+    auth=AsyncStatelessJWTAuth()
 )
-@comment_exist
-@has_edit_access
-def edit_comment(
-        request: HttpRequest, comment_id: int,
+@resolve_comment("author", check=has_edit_access)
+async def edit_comment(
+        request: HttpRequest, comment: Comment,
         payload: schemas.UpdateCommentSchema
 ) -> schemas.CommentSchema:
-    comment = Comment.objects.get(id=comment_id)
     comment.text = payload.text
-    comment.save()
-    return schemas.CommentSchema.from_orm(comment)
+    await moderate(comment)
+    await comment.asave()
+
+    if ASYNC_MODERATION:
+        await sync_to_async(moderate_comment.delay)(comment.id)
+
+    return await sync_to_async(schemas.CommentSchema.from_orm)(comment)
 
 
 @router.delete(
     "/{comment_id}",
-    response={200: str, 403: str, 404: str}, auth=JWTAuth()
+    response={200: str, 403: str, 404: str}, auth=StatelessJWTAuth()
 )
-@comment_exist
-@has_delete_access
+@resolve_comment("post", check=has_delete_access)
 def delete_comment(
-        request: HttpRequest, comment_id: int
+        request: HttpRequest, comment: Comment
 ) -> Response:
-    comment = Comment.objects.get(id=comment_id)
-    comment.delete()
+    Comment.objects.subtree(comment).delete()
     return Response(
         {"detail": "Comment has been successfully deleted"},
         status=status.HTTP_200_OK
@@ -86,25 +151,23 @@ def delete_comment(
 
 @router.post(
     "/create/{post_id}",
-    response={200: schemas.CommentSchema, 400: str},
-    auth=JWTAuth()
+    response={200: schemas.CommentSchema, 400: str, 404: str},
+    auth=AsyncStatelessJWTAuth()
 )
-@post_exist
-def create_comment(
-        request: HttpRequest, post_id: int,
+@resolve_post(visible=True)
+async def create_comment(
+        request: HttpRequest, post: Post,
         payload: schemas.CreateCommentSchema
 ) -> schemas.CommentSchema:
-    decision = block_decision(payload.text)
     comment = Comment(
-        post_id=post_id,
+        post=post,
         author=request.user,
-        text=payload.text,
-        is_blocked=decision
+        text=payload.text
     )
     if payload.parent_id:
         try:
-            parent = Comment.objects.get(id=payload.parent_id)
-            if parent.post_id != post_id:
+            parent = await Comment.objects.aget(id=payload.parent_id)
+            if parent.post_id != post.id:
                 raise HttpError(
                     status.HTTP_400_BAD_REQUEST,
                     "Parent comment should be from the same post"
@@ -115,56 +178,155 @@ def create_comment(
                 status.HTTP_400_BAD_REQUEST,
                 "Parent comment does not exist"
             )
-    comment.save()
+    await moderate(comment)
+    await comment.asave()
+
+    if ASYNC_MODERATION:
+        await sync_to_async(moderate_comment.delay)(comment.id)
 
     if (
-            comment.post.reply_on_comments
-            and comment.post.author != comment.author
+            post.reply_on_comments
+            and post.author_id != comment.author_id
     ):
-        auto_reply_to_comment.apply_async(
-            kwargs={"comment_id": comment.id},
-            countdown=int(comment.post.reply_time.total_seconds())
+        await ScheduledReply.objects.acreate(
+            comment=comment,
+            due_at=reply_due_at(comment.created_at, post.reply_time)
         )
 
-    return schemas.CommentSchema.from_orm(comment)
+    return await sync_to_async(schemas.CommentSchema.from_orm)(comment)
+
+
+@router.post(
+    "/create/{post_id}/bulk",
+    response={200: list[schemas.CommentSchema], 400: str, 404: str},
+    auth=StatelessJWTAuth()
+)
+@resolve_post(visible=True)
+def create_comments_bulk(
+        request: HttpRequest, post: Post,
+        payload: schemas.BulkCreateCommentSchema
+) -> list[Comment]:
+    items = payload.comments
+    levels = bulk_levels(items)
+    parents = bulk_parents(post, items)
+
+    comments = [
+        Comment(post=post, author=request.user, text=item.text)
+        for item in items
+    ]
+    if ASYNC_MODERATION:
+        for comment in comments:
+            comment.moderation_status = ModerationStatus.PENDING
+    else:
+        decisions = block_decisions([item.text for item in items])
+        for comment, is_blocked in zip(comments, decisions):
+            comment.is_blocked = is_blocked
+
+    with transaction.atomic():
+        # A level is inserted once the ids of its parents are known
+        for level in levels:
+            for index in level:
+                item = items[index]
+                if item.parent_index is not None:
+                    parent = comments[item.parent_index]
+                else:
+                    parent = parents.get(item.parent_id)
+                if parent is not None:
+                    comments[index].parent = parent
+                    comments[index].path = parent.children_path
+            Comment.objects.bulk_create([comments[i] for i in level])
+        # bulk_create sends no signals
+        count_created_comments(post.id, comments)
+        invalidate(FEED_SCOPE, POST_SCOPE.format(post_id=post.id))
+
+        if post.reply_on_comments and post.author_id != request.user.id:
+            due_at = reply_due_at(timezone.now(), post.reply_time)
+            ScheduledReply.objects.bulk_create([
+                ScheduledReply(comment=comment, due_at=due_at)
+                for comment in comments
+            ])
+
+    if ASYNC_MODERATION:
+        for comment in comments:
+            moderate_comment.delay(comment.id)
+
+    return comments
+
+
+def bulk_levels(items: list[schemas.BulkCommentSchema]) -> list[list[int]]:
+    """Positions of the comments grouped by depth within the batch"""
+    levels = []
+    depths = []
+    for index, item in enumerate(items):
+        depth = 0
+        if item.parent_index is not None:
+            if item.parent_id:
+                raise HttpError(
+                    status.HTTP_400_BAD_REQUEST,
+                    "Pass either parent_id or parent_index"
+                )
+            if not 0 <= item.parent_index < index:
+                raise HttpError(
+                    status.HTTP_400_BAD_REQUEST,
+                    "parent_index should point to an earlier comment"
+                )
+            depth = depths[item.parent_index] + 1
+        depths.append(depth)
+        if depth == len(levels):
+            levels.append([])
+        levels[depth].append(index)
+    return levels
+
+
+def bulk_parents(
+        post: Post, items: list[schemas.BulkCommentSchema]
+) -> dict[int, Comment]:
+    """Existing parent comments of the batch, loaded in one query"""
+    parent_ids = {item.parent_id for item in items if item.parent_id}
+    if not parent_ids:
+        return {}
+    parents = Comment.objects.in_bulk(parent_ids)
+    if len(parents) != len(parent_ids):
+        raise HttpError(
+            status.HTTP_400_BAD_REQUEST,
+            "Parent comment does not exist"
+        )
+    if any(parent.post_id != post.id for parent in parents.values()):
+        raise HttpError(
+            status.HTTP_400_BAD_REQUEST,
+            "Parent comment should be from the same post"
+        )
+    return parents
+
+
+async def moderate(comment: Comment) -> None:
+    """Mark the comment pending or block it right away, before saving"""
+    if ASYNC_MODERATION:
+        comment.moderation_status = ModerationStatus.PENDING
+    else:
+        comment.is_blocked = await ablock_decision(comment.text)
 
 
 def get_comments_daily_breakdown(
         date_from: date, date_to: date
-) -> list[schemas.CommentAnalytics]:
-    comments_aggregation = (
-        Comment.objects
-        .filter(created_at__date__range=(date_from, date_to))
-        .annotate(date=TruncDate("created_at"))
-        .values("date")
-        .annotate(
-            created_comments=Count("id"),
-            blocked_comments=Count("id", filter=Q(is_blocked=True))
-        )
+) -> QuerySet:
+    return (
+        CommentDailyStats.objects
+        .filter(date__range=(date_from, date_to), created_comments__gt=0)
+        .values("date", "created_comments", "blocked_comments")
         .order_by("date")
     )
 
-    analytics = [
-        schemas.CommentAnalytics(
-            date=item["date"],
-            created_comments=item["created_comments"],
-            blocked_comments=item["blocked_comments"]
-        )
-        for item in comments_aggregation
-    ]
-
-    return analytics
-
 
 @router.get(
     "/daily-breakdown/",
     response=list[schemas.CommentAnalytics]
 )
-@paginate(PageNumberPagination, page_size=BREAKDOWN_PAGINATION_NUMBER)
+@list_pagination(BREAKDOWN_PAGINATION_NUMBER, ordering=("date",))
 def comments_daily_breakdown(
         request: HttpRequest,
         params: schemas.DateRangeSchema = Query(...)
-) -> list[schemas.CommentAnalytics]:
+) -> QuerySet:
     date_from = params.date_from
     date_to = params.date_to
 
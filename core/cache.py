@@ -0,0 +1,137 @@
+import hashlib
+import time
+from functools import wraps
+from typing import (
+    Any,
+    Callable
+)
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import (
+    HttpRequest,
+    HttpResponse
+)
+
+KEY_PREFIX = "response"
+
+LOCK_POLL_INTERVAL = 0.05
+
+# Scopes of the post reads: the feed embeds every post with its
+# comments, a post scope covers the post and its comment lists
+FEED_SCOPE = "feed"
+POST_SCOPE = "post:{post_id}"
+
+
+def cached_response(scope: str) -> Callable:
+    """
+    View decorator (apply with ninja's ``decorate_view``) caching the
+    JSON of successful anonymous GET responses. ``scope`` is formatted
+    with the path parameters, e.g. ``"post:{post_id}"``, and names the
+    version the entries are stored under: ``invalidate(scope)`` retires
+    them all at once.
+
+    Only one request rebuilds a missing entry, concurrent ones wait for
+    it (up to RESPONSE_CACHE_LOCK_TIMEOUT) instead of all hitting the
+    database.
+    """
+
+    def decorator(run: Callable) -> Callable:
+        @wraps(run)
+        def wrapper(request: HttpRequest, **kwargs: Any) -> HttpResponse:
+            if not is_cacheable(request):
+                return run(request, **kwargs)
+
+            key = entry_key(scope.format(**kwargs), request)
+            entry = cache.get(key)
+            if entry is not None:
+                return cached(entry)
+
+            lock_key = f"{key}:lock"
+            if not cache.add(
+                    lock_key, 1, settings.RESPONSE_CACHE_LOCK_TIMEOUT
+            ):
+                entry = wait_for_entry(key)
+                if entry is not None:
+                    return cached(entry)
+                # The rebuilding request is taking too long, serve this
+                # one directly rather than queueing behind it
+                return run(request, **kwargs)
+
+            try:
+                response = run(request, **kwargs)
+                if response.status_code == 200:
+                    cache.set(
+                        key,
+                        (response.content, response["Content-Type"]),
+                        settings.RESPONSE_CACHE_TTL
+                    )
+            finally:
+                cache.delete(lock_key)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def is_cacheable(request: HttpRequest) -> bool:
+    # Authenticated readers also see their own content awaiting
+    # moderation, so their responses are never shared
+    return (
+        settings.RESPONSE_CACHE_ENABLED
+        and request.method == "GET"
+        and "HTTP_AUTHORIZATION" not in request.META
+    )
+
+
+def entry_key(scope: str, request: HttpRequest) -> str:
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"{KEY_PREFIX}:{scope}:{scope_version(scope)}:{digest}"
+
+
+def scope_version(scope: str) -> int:
+    key = f"{KEY_PREFIX}:version:{scope}"
+    version = cache.get(key)
+    if version is None:
+        # Start from a fresh value, not 0, so an evicted version never
+        # brings back entries stored before it was bumped
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def wait_for_entry(key: str) -> tuple | None:
+    deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(f"{key}:lock") is None:
+            return None
+    return None
+
+
+def cached(entry: tuple) -> HttpResponse:
+    content, content_type = entry
+    return HttpResponse(content, content_type=content_type)
+
+
+def invalidate(*scopes: str) -> None:
+    """
+    Retire the cached responses of the scopes. The versions are bumped
+    again once the current transaction commits, so a read racing the
+    write cannot cache rows from before it under the new version.
+    """
+    bump_versions(scopes)
+    transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def bump_versions(scopes: tuple[str, ...]) -> None:
+    version = time.time_ns()
+    cache.set_many(
+        {f"{KEY_PREFIX}:version:{scope}": version for scope in scopes},
+        None
+    )
@@ -0,0 +1,76 @@
+import inspect
+from functools import wraps
+from typing import (
+    Any,
+    Callable
+)
+
+from django.db.models import (
+    Model,
+    QuerySet
+)
+from django.http import HttpRequest
+from ninja.errors import HttpError
+from ninja_extra import status
+
+Check = Callable[[HttpRequest, Any], None]
+
+
+def resolve_object(
+        model: type[Model], path_param: str, argument: str,
+        not_found: str, select_related: tuple[str, ...] = (),
+        check: Check | None = None, visible: bool = False
+) -> Callable:
+    """
+    View decorator loading the object whose id is the ``path_param``
+    path parameter in a single query (with ``select_related``), running
+    the permission ``check`` on it and passing it to the view as
+    ``argument``. The view declares ``argument`` in place of the id,
+    the API still exposes ``path_param``. With ``visible`` objects the
+    user may not see (awaiting moderation) are not found.
+    """
+    queryset = model.objects.select_related(*select_related)
+
+    def lookup(request: HttpRequest) -> QuerySet:
+        if visible:
+            return queryset.visible_to(request.user)
+        return queryset
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(
+                    request: HttpRequest, **kwargs
+            ) -> Any:
+                object_id = kwargs.pop(path_param)
+                try:
+                    obj = await lookup(request).aget(id=object_id)
+                except model.DoesNotExist:
+                    raise HttpError(status.HTTP_404_NOT_FOUND, not_found)
+                if check is not None:
+                    check(request, obj)
+                return await func(request, **{argument: obj}, **kwargs)
+            wrapper = async_wrapper
+        else:
+            @wraps(func)
+            def wrapper(request: HttpRequest, **kwargs) -> Any:
+                object_id = kwargs.pop(path_param)
+                try:
+                    obj = lookup(request).get(id=object_id)
+                except model.DoesNotExist:
+                    raise HttpError(status.HTTP_404_NOT_FOUND, not_found)
+                if check is not None:
+                    check(request, obj)
+                return func(request, **{argument: obj}, **kwargs)
+
+        # Show ninja the id path parameter instead of the object
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            inspect.Parameter(
+                path_param, param.kind, annotation=int
+            ) if param.name == argument else param
+            for param in signature.parameters.values()
+        ])
+        return wrapper
+
+    return decorator
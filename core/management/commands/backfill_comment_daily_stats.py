@@ -0,0 +1,20 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from comment.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily comment rollup from the comments table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date-from", type=date.fromisoformat)
+        parser.add_argument("--date-to", type=date.fromisoformat)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        days = rebuild_daily_stats(
+            options["date_from"], options["date_to"], options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats of {days} days"))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from comment.models import (
+    Comment,
+    path_segment
+)
+
+
+class Command(BaseCommand):
+    help = "Fill the materialized path of existing comments in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--start-id", type=int, default=0,
+            help="Resume after the last id reported by a previous run"
+        )
+
+    def handle(self, *args, **options):
+        # A reply is always created after its parent, so walking ids in
+        # ascending order meets every parent before its replies.
+        last_id = options["start_id"]
+        updated = 0
+        while True:
+            chunk = list(
+                Comment.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "parent_id")[:options["chunk_size"]]
+            )
+            if not chunk:
+                break
+
+            paths = dict(
+                Comment.objects.filter(id__in={
+                    parent_id for _, parent_id in chunk
+                    if parent_id is not None
+                }).values_list("id", "path")
+            )
+            comments = []
+            for comment_id, parent_id in chunk:
+                path = ""
+                if parent_id is not None:
+                    path = paths[parent_id] + path_segment(parent_id)
+                paths[comment_id] = path
+                comments.append(Comment(id=comment_id, path=path))
+
+            with transaction.atomic():
+                Comment.objects.bulk_update(comments, ["path"])
+            updated += len(comments)
+            last_id = chunk[-1][0]
+            self.stdout.write(f"Updated {updated} comments, last id {last_id}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled paths of {updated} comments"
+        ))
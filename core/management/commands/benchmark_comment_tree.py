@@ -0,0 +1,69 @@
+import random
+import time
+from datetime import (
+    datetime,
+    timedelta,
+    timezone
+)
+
+from django.core.management.base import BaseCommand
+from pydantic import TypeAdapter
+
+from comment.schemas import CommentSchema
+
+
+def synthetic_rows(size: int, reply_share: float, seed: int) -> list[dict]:
+    """Comment rows of one thread, newest first like the tree loader"""
+    rng = random.Random(seed)
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for comment_id in range(1, size + 1):
+        parent_id = None
+        if comment_id > 1 and rng.random() < reply_share:
+            parent_id = rng.randrange(1, comment_id)
+        rows.append({
+            "id": comment_id,
+            "parent_id": parent_id,
+            "text": f"Synthetic comment number {comment_id}",
+            "created_at": started + timedelta(seconds=comment_id),
+            "is_blocked": False,
+            "moderation_status": "moderated",
+            "author_id": comment_id % 50 + 1,
+            "author__username": f"user{comment_id % 50 + 1}",
+            "author__is_staff": False,
+        })
+    rows.reverse()
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Measure comment tree building on synthetic threads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[10_000, 100_000]
+        )
+        parser.add_argument("--reply-share", type=float, default=0.8)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        adapter = TypeAdapter(list[CommentSchema])
+        for size in options["sizes"]:
+            rows = synthetic_rows(
+                size, options["reply_share"], options["seed"]
+            )
+
+            started = time.perf_counter()
+            tree = CommentSchema.build_comment_hierarchy(rows)
+            built = time.perf_counter() - started
+
+            started = time.perf_counter()
+            adapter.dump_json(adapter.validate_python(tree))
+            serialized = time.perf_counter() - started
+
+            self.stdout.write(f"Comments: {size} ({len(tree)} roots)")
+            self.stdout.write(f"Build: {built * 1000:.1f} ms")
+            self.stdout.write(f"Validate and dump: {serialized * 1000:.1f} ms")
+            self.stdout.write(self.style.SUCCESS(
+                f"Throughput: {size / built:,.0f} comments/s"
+            ))
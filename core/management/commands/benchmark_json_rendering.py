@@ -0,0 +1,91 @@
+import time
+import tracemalloc
+from datetime import (
+    datetime,
+    timedelta,
+    timezone
+)
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from ninja.renderers import JSONRenderer
+from pydantic import TypeAdapter
+
+from comment.schemas import CommentSchema
+from core.management.commands.benchmark_comment_tree import synthetic_rows
+from core.renderers import ORJSONRenderer
+from post.models import Post
+from post.schemas import PostSchema
+
+User = get_user_model()
+
+
+def synthetic_posts(
+        posts: int, comments: int, reply_share: float, seed: int
+) -> list:
+    """A GET /posts page of large threads, dumped the way ninja does"""
+    author = User(id=1, username="user1", is_staff=False)
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    schemas = []
+    for post_id in range(1, posts + 1):
+        post = Post(
+            id=post_id,
+            author=author,
+            title=f"Synthetic post number {post_id}",
+            text=f"Synthetic text of post {post_id}",
+            created_at=started,
+            comment_count=comments,
+            last_comment_at=started + timedelta(seconds=comments)
+        )
+        schema = PostSchema.from_orm(post)
+        schema.comments = CommentSchema.build_comment_hierarchy(
+            synthetic_rows(comments, reply_share, seed + post_id)
+        )
+        schemas.append(schema)
+    adapter = TypeAdapter(list[PostSchema])
+    return adapter.dump_python(adapter.validate_python(schemas))
+
+
+class Command(BaseCommand):
+    help = "Compare the default and the orjson renderer on large posts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=5)
+        parser.add_argument("--comments", type=int, default=10_000)
+        parser.add_argument("--reply-share", type=float, default=0.8)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        data = synthetic_posts(
+            options["posts"], options["comments"],
+            options["reply_share"], options["seed"]
+        )
+        self.stdout.write(
+            f"Posts: {options['posts']} with {options['comments']} "
+            f"comments each"
+        )
+
+        timings = {}
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            name = type(renderer).__name__
+            best = float("inf")
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                content = renderer.render(None, data, response_status=200)
+                best = min(best, time.perf_counter() - started)
+
+            tracemalloc.start()
+            renderer.render(None, data, response_status=200)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            timings[name] = best
+            self.stdout.write(
+                f"{name}: {best * 1000:.1f} ms, "
+                f"{len(content) / 2 ** 20:.1f} MiB output, "
+                f"{peak / 2 ** 20:.1f} MiB peak allocations"
+            )
+
+        speedup = timings["JSONRenderer"] / timings["ORJSONRenderer"]
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {speedup:.1f}x"))
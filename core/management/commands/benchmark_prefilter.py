@@ -0,0 +1,47 @@
+import random
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from integrations.prefilter import prefilter
+
+SAMPLE_TEXTS = [
+    "Great post, thanks!",
+    "I really love this article",
+    "Nice idea, keep up the good work",
+    "This is the dumbest take I have read all week",
+    "Does anyone know where the original data came from?",
+    "What the fuuuuck is this",
+    "you are a b1tch and everybody knows it",
+    "Sh1t article, unsubscribing",
+    "I disagree with the second paragraph, the numbers look off",
+    "wow",
+]
+
+
+class Command(BaseCommand):
+    help = "Measure lexicon prefilter throughput on a single core"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--texts", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        texts = [
+            rng.choice(SAMPLE_TEXTS) for _ in range(options["texts"])
+        ]
+
+        started = time.perf_counter()
+        verdicts = Counter(prefilter.check(text).value for text in texts)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Texts: {len(texts)}")
+        self.stdout.write(f"Elapsed: {elapsed:.3f} s")
+        for verdict, count in sorted(verdicts.items()):
+            share = count / len(texts)
+            self.stdout.write(f"{verdict}: {count} ({share:.1%})")
+        self.stdout.write(self.style.SUCCESS(
+            f"Throughput: {len(texts) / elapsed:,.0f} texts/s"
+        ))
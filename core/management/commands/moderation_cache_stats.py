@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from integrations.cache import verdict_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the moderation verdict cache"
+
+    def handle(self, *args, **options):
+        stats = verdict_cache.shared_stats()
+        if stats is None:
+            self.stdout.write(
+                "Redis tier is not configured, showing counters "
+                "of this process only"
+            )
+            stats = verdict_cache.stats()
+
+        for name, value in stats.items():
+            self.stdout.write(f"{name}: {value}")
+        saved_calls = stats["local_hits"] + stats["redis_hits"]
+        self.stdout.write(
+            self.style.SUCCESS(f"Gemini calls saved: {saved_calls}")
+        )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db.models import (
+    Count,
+    Max,
+    OuterRef,
+    Q,
+    Subquery
+)
+from django.db.models.functions import Coalesce
+
+from comment.models import Comment
+from post.models import Post
+
+
+def counter_values() -> dict:
+    """Expressions recomputing every comment counter of a post"""
+    comments = Comment.objects.filter(post_id=OuterRef("id")).order_by()
+    stats = comments.values("post_id")
+    return {
+        "comment_count": Coalesce(
+            Subquery(stats.annotate(total=Count("id")).values("total")), 0
+        ),
+        "blocked_comment_count": Coalesce(Subquery(
+            stats.annotate(
+                total=Count("id", filter=Q(is_blocked=True))
+            ).values("total")
+        ), 0),
+        "last_comment_at": Subquery(
+            stats.annotate(last=Max("created_at")).values("last")
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized comment counters of posts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        values = counter_values()
+        ids = Post.objects.order_by("id").values_list("id", flat=True)
+        last_id = 0
+        reconciled = 0
+        while True:
+            chunk = list(ids.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            reconciled += Post.objects.filter(
+                id__gte=chunk[0], id__lte=chunk[-1]
+            ).update(**values)
+            last_id = chunk[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled the counters of {reconciled} posts"
+        ))
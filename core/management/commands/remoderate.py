@@ -0,0 +1,217 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from itertools import (
+    chain,
+    islice
+)
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from comment.models import Comment
+from comment.signals import count_remoderated_comments
+from core.cache import (
+    FEED_SCOPE,
+    POST_SCOPE,
+    invalidate
+)
+from core.models import ModerationStatus
+from integrations.backends import (
+    BackendError,
+    get_moderation_backend
+)
+from integrations.moderation import block_decisions
+from post.models import Post
+
+
+def load_checkpoint(path: str, version: str) -> dict[str, int]:
+    """Last re-moderated id per model, empty for another backend version"""
+    try:
+        with open(path) as checkpoint:
+            state = json.load(checkpoint)
+    except FileNotFoundError:
+        return {}
+    if state.get("version") != version:
+        return {}
+    return state["last_ids"]
+
+
+def save_checkpoint(path: str, version: str, last_ids: dict) -> None:
+    # Replaced in one step, so a crash never leaves half a file behind
+    with open(f"{path}.tmp", "w") as checkpoint:
+        json.dump({"version": version, "last_ids": last_ids}, checkpoint)
+    os.replace(f"{path}.tmp", path)
+
+
+def apply_verdict(instance: Model, is_blocked: bool) -> bool:
+    """Store the verdict on the instance, return whether it changed"""
+    if (
+            instance.is_blocked == is_blocked
+            and instance.moderation_status == ModerationStatus.MODERATED
+    ):
+        return False
+    instance.is_blocked = is_blocked
+    instance.moderation_status = ModerationStatus.MODERATED
+    return True
+
+
+def write_post_verdicts(posts: list[Post]) -> None:
+    now = timezone.now()
+    for post in posts:
+        # bulk_update leaves auto_now fields alone
+        post.updated_at = now
+    with transaction.atomic():
+        Post.objects.bulk_update(
+            posts, ["is_blocked", "moderation_status", "updated_at"]
+        )
+        # bulk_update sends no signals
+        invalidate(FEED_SCOPE, *(
+            POST_SCOPE.format(post_id=post.id) for post in posts
+        ))
+
+
+def write_comment_verdicts(comments: list[Comment]) -> None:
+    with transaction.atomic():
+        Comment.objects.bulk_update(
+            comments, ["is_blocked", "moderation_status"]
+        )
+        count_remoderated_comments(comments)
+
+
+# Model, loaded fields, moderated text and writer of changed rows
+TARGETS = {
+    "posts": (
+        Post, ("title", "text", "is_blocked", "moderation_status"),
+        lambda post: post.title + post.text, write_post_verdicts
+    ),
+    "comments": (
+        Comment,
+        ("post_id", "created_at", "text", "is_blocked", "moderation_status"),
+        lambda comment: comment.text, write_comment_verdicts
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Moderate existing posts and comments again, e.g. after the "
+        "moderation prompt changed. Progress is checkpointed per chunk "
+        "under the moderation backend version, a run interrupted for any "
+        "reason continues where it stopped when started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--models", nargs="+", choices=list(TARGETS),
+            default=list(TARGETS)
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers", type=int, default=4,
+            help="Backend calls made at once"
+        )
+        parser.add_argument(
+            "--checkpoint", default="remoderate-checkpoint.json"
+        )
+        parser.add_argument(
+            "--restart", action="store_true",
+            help="Ignore the checkpoint of a previous run"
+        )
+
+    def handle(self, *args, **options):
+        self.version = get_moderation_backend().version
+        self.checkpoint = options["checkpoint"]
+        last_ids = {}
+        if not options["restart"]:
+            last_ids = load_checkpoint(self.checkpoint, self.version)
+        if last_ids:
+            self.stdout.write(f"Resuming after {last_ids}")
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            for name in options["models"]:
+                self.remoderate(
+                    name, executor, options["chunk_size"], last_ids
+                )
+
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        self.stdout.write(self.style.SUCCESS("Re-moderation finished"))
+
+    def remoderate(
+            self, name: str, executor: ThreadPoolExecutor, chunk_size: int,
+            last_ids: dict[str, int]
+    ) -> None:
+        model, fields, text_of, write = TARGETS[name]
+        rows = model.objects.filter(
+            id__gt=last_ids.get(name, 0)
+        ).order_by("id")
+        total = rows.count()
+        stream = rows.only(*fields).iterator(chunk_size=chunk_size)
+
+        done = changed = 0
+        started = time.monotonic()
+        while chunk := list(islice(stream, chunk_size)):
+            try:
+                decisions = self.moderate(
+                    executor, [text_of(row) for row in chunk]
+                )
+            except BackendError as error:
+                # Nothing of the chunk is written and the checkpoint
+                # stays before it, a rerun starts over from its first row
+                raise CommandError(
+                    f"{name}: moderation backend failed after "
+                    f"{last_ids.get(name, 0)}, rerun to resume: {error}"
+                )
+            updated = [
+                row for row, is_blocked in zip(chunk, decisions)
+                if apply_verdict(row, is_blocked)
+            ]
+            if updated:
+                write(updated)
+
+            done += len(chunk)
+            changed += len(updated)
+            last_ids[name] = chunk[-1].id
+            save_checkpoint(self.checkpoint, self.version, last_ids)
+            self.report(name, done, total, changed, started)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{name}: {done} checked, {changed} changed"
+        ))
+
+    @staticmethod
+    def moderate(
+            executor: ThreadPoolExecutor, texts: list[str]
+    ) -> list[bool]:
+        # One backend round trip per slice, the pool bounds how many
+        # of them run at once. Failures raise rather than answering the
+        # default verdict, which would overwrite the real ones.
+        size = settings.MODERATION_BATCH_SIZE
+        slices = [texts[i:i + size] for i in range(0, len(texts), size)]
+        return list(chain.from_iterable(
+            executor.map(partial(block_decisions, strict=True), slices)
+        ))
+
+    def report(
+            self, name: str, done: int, total: int, changed: int,
+            started: float
+    ) -> None:
+        elapsed = time.monotonic() - started
+        rate = done / elapsed if elapsed else 0
+        eta = "unknown"
+        if rate:
+            eta = timedelta(seconds=round(max(total - done, 0) / rate))
+        self.stdout.write(
+            f"{name}: {done}/{total} ({done / max(total, 1):.1%}), "
+            f"{changed} changed, {rate:,.0f} rows/s, ETA {eta}"
+        )
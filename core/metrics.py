@@ -0,0 +1,172 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import (
+    dataclass,
+    field
+)
+from typing import (
+    Any,
+    Callable,
+    Iterator
+)
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction
+)
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import (
+    HttpRequest,
+    HttpResponse
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestMetrics:
+    """
+    Time spent by one request, in seconds, by kind of work, and the
+    retries and failures of its backend calls
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db: float = 0.0
+    backend: float = 0.0
+    serialize: float = 0.0
+    backend_retries: int = 0
+    backend_failures: int = 0
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+
+# Metrics of the sampled request being handled, copied into the
+# threads sync_to_async runs the ORM in, None for other requests
+current_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+@contextmanager
+def timed(kind: str) -> Iterator[None]:
+    """Add the time spent in the block to the request's ``kind``"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(
+            metrics, kind,
+            getattr(metrics, kind) + time.perf_counter() - started
+        )
+
+
+def count(kind: str) -> None:
+    """Add one to the request's ``kind`` counter"""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        setattr(metrics, kind, getattr(metrics, kind) + 1)
+
+
+def time_query(
+        execute: Callable, sql: str, params: Any, many: bool, context: dict
+) -> Any:
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    metrics.db_queries += 1
+    with timed("db"):
+        return execute(sql, params, many, context)
+
+
+def install_query_timer(
+        sender: type, connection: BaseDatabaseWrapper, **kwargs
+) -> None:
+    """connection_created receiver timing every query of the connection"""
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure a REQUEST_METRICS_SAMPLE_RATE share of requests: query
+    count, database, backend (moderation and replies) and serialization
+    time. They are returned in a Server-Timing header and logged as one
+    JSON line each.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)
+        if not is_sampled():
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return report(request, response, metrics)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if not is_sampled():
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return report(request, response, metrics)
+
+
+def is_sampled() -> bool:
+    rate = settings.REQUEST_METRICS_SAMPLE_RATE
+    return rate >= 1 or random.random() < rate
+
+
+def report(
+        request: HttpRequest, response: HttpResponse, metrics: RequestMetrics
+) -> HttpResponse:
+    total = metrics.total
+    response["Server-Timing"] = ", ".join((
+        f'db;dur={metrics.db * 1000:.1f};desc="{metrics.db_queries} queries"',
+        f"backend;dur={metrics.backend * 1000:.1f};"
+        f'desc="{metrics.backend_retries} retries, '
+        f'{metrics.backend_failures} failures"',
+        f"serialize;dur={metrics.serialize * 1000:.1f}",
+        f"total;dur={total * 1000:.1f}",
+    ))
+    logger.info(json.dumps({
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        "db_queries": metrics.db_queries,
+        "db_ms": round(metrics.db * 1000, 1),
+        "backend_ms": round(metrics.backend * 1000, 1),
+        "backend_retries": metrics.backend_retries,
+        "backend_failures": metrics.backend_failures,
+        "serialize_ms": round(metrics.serialize * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+    }))
+    return response
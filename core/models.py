@@ -0,0 +1,16 @@
+from django.db import models
+from django.db.models import Q
+
+
+class ModerationStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    MODERATED = "moderated", "Moderated"
+
+
+class ModeratedQuerySet(models.QuerySet):
+    def visible_to(self, user) -> "ModeratedQuerySet":
+        """Hide content awaiting moderation from everyone but its author"""
+        visible = Q(moderation_status=ModerationStatus.MODERATED)
+        if user.is_authenticated:
+            visible |= Q(author_id=user.id)
+        return self.filter(visible)
@@ -0,0 +1,174 @@
+import base64
+import binascii
+import json
+import operator
+from datetime import datetime
+from functools import reduce
+from typing import (
+    Any,
+    Callable,
+    Optional
+)
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import (
+    Q,
+    QuerySet
+)
+from django.http import HttpRequest
+from ninja import Schema
+from ninja.errors import HttpError
+from ninja.pagination import (
+    PageNumberPagination,
+    PaginationBase,
+    paginate
+)
+from ninja_extra import status
+
+Hydrate = Callable[[HttpRequest, list], list]
+
+
+class HydratedPageNumberPagination(PageNumberPagination):
+    """
+    Slices the queryset returned by the view in SQL, then hands only the
+    objects of the requested page to ``hydrate``, which turns them into
+    response items (e.g. attaching data loaded in bulk for the page).
+    """
+
+    def __init__(self, hydrate: Hydrate | None = None, **kwargs: Any) -> None:
+        self.hydrate = hydrate
+        super().__init__(**kwargs)
+
+    def paginate_queryset(
+            self, queryset: QuerySet, pagination: Any, **params: Any
+    ) -> dict[str, Any]:
+        result = super().paginate_queryset(queryset, pagination, **params)
+        if self.hydrate is not None:
+            result["items"] = self.hydrate(
+                params["request"], list(result["items"])
+            )
+        return result
+
+
+class CursorPagination(PaginationBase):
+    """
+    Keyset pagination: each page continues strictly after the last item
+    of the previous one in ``ordering``, so a deep page costs the same
+    as the first and no count query is run. The ordering must be unique
+    (end it with the primary key) and the cursor is an opaque token.
+    """
+
+    class Input(Schema):
+        cursor: Optional[str] = None
+
+    class Output(Schema):
+        items: list[Any]
+        next_cursor: Optional[str] = None
+
+    def __init__(
+            self, ordering: tuple[str, ...] = ("-created_at", "-id"),
+            page_size: int = settings.PAGE_PAGINATION_NUMBER,
+            hydrate: Hydrate | None = None, **kwargs: Any
+    ) -> None:
+        self.ordering = ordering
+        self.page_size = page_size
+        self.hydrate = hydrate
+        super().__init__(**kwargs)
+
+    def paginate_queryset(
+            self, queryset: QuerySet, pagination: Input, **params: Any
+    ) -> dict[str, Any]:
+        queryset = queryset.order_by(*self.ordering)
+        if pagination.cursor:
+            try:
+                queryset = queryset.filter(
+                    self.after(decode_cursor(pagination.cursor))
+                )
+            except (ValidationError, ValueError, TypeError):
+                raise invalid_cursor()
+
+        items = list(queryset[:self.page_size + 1])
+        next_cursor = None
+        if len(items) > self.page_size:
+            items = items[:self.page_size]
+            next_cursor = encode_cursor([
+                item_value(items[-1], field.lstrip("-"))
+                for field in self.ordering
+            ])
+
+        if self.hydrate is not None:
+            items = self.hydrate(params["request"], items)
+        return {"items": items, "next_cursor": next_cursor}
+
+    def after(self, values: list) -> Q:
+        """Rows placed after ``values`` in the ordering"""
+        if len(values) != len(self.ordering):
+            raise invalid_cursor()
+        conditions = []
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            conditions.append(equal & Q(**{f"{name}__{lookup}": value}))
+            equal &= Q(**{name: value})
+        return reduce(operator.or_, conditions)
+
+
+def list_pagination(
+        page_size: int, ordering: tuple[str, ...] = ("-created_at", "-id"),
+        hydrate: Hydrate | None = None
+) -> Callable:
+    """
+    Paginate decorator of the list endpoints: keyset pages when
+    CURSOR_PAGINATION is on, numbered pages with a count otherwise.
+    """
+    if settings.CURSOR_PAGINATION:
+        return paginate(
+            CursorPagination,
+            ordering=ordering, page_size=page_size, hydrate=hydrate
+        )
+    return paginate(
+        HydratedPageNumberPagination, page_size=page_size, hydrate=hydrate
+    )
+
+
+def item_value(item: Any, field: str) -> Any:
+    if isinstance(item, dict):
+        return item[field]
+    return getattr(item, field)
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Keeps the microseconds of datetimes, which DjangoJSONEncoder cuts to
+    milliseconds: rows created within the same millisecond after the
+    page boundary would be skipped. The ISO string is parsed back by
+    the field when the cursor is filtered on.
+    """
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, cls=CursorEncoder).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise invalid_cursor()
+    if not isinstance(values, list):
+        raise invalid_cursor()
+    return values
+
+
+def invalid_cursor() -> HttpError:
+    return HttpError(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
@@ -0,0 +1,132 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import (
+    RequestFactory,
+    TestCase,
+    override_settings
+)
+from ninja_jwt.tokens import AccessToken
+
+from comment.models import Comment
+from core.cache import (
+    POST_SCOPE,
+    entry_key
+)
+from integrations.tasks import auto_reply_to_comment
+from post.models import Post
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.other_user = User.objects.create_user(
+            username="otheruser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="Test Content"
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.other_user, text="Root Comment"
+        )
+        self.url = f"/api/posts/{self.post.id}"
+
+    def test_repeated_read_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        # Only the ETag version lookup of the post
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+
+    def test_pages_are_cached_separately(self):
+        url = f"/api/comments/post/{self.post.id}"
+        self.client.get(url, {"page": 1})
+        with self.assertNumQueries(1):
+            self.client.get(url, {"page": 1})
+        response = self.client.get(url, {"page": 2})
+        self.assertEqual(response.json()["items"], [])
+
+    def test_comment_save_invalidates_post_and_feed(self):
+        self.client.get(self.url)
+        self.client.get("/api/posts/")
+        Comment.objects.create(
+            post=self.post, author=self.user, text="Another Comment"
+        )
+
+        post = self.client.get(self.url).json()
+        self.assertEqual(len(post["comments"]), 2)
+        feed = self.client.get("/api/posts/").json()
+        self.assertEqual(len(feed["items"][0]["comments"]), 2)
+
+    @mock.patch(
+        "integrations.tasks.response_to_comment",
+        return_value="Thanks for the comment"
+    )
+    def test_auto_reply_invalidates_post(self, response_to_comment):
+        self.client.get(self.url)
+        auto_reply_to_comment(self.comment.id)
+
+        comments = self.client.get(self.url).json()["comments"]
+        self.assertEqual(
+            comments[0]["replies"][0]["text"], "Thanks for the comment"
+        )
+
+    def test_post_delete_invalidates_reads(self):
+        self.client.get(self.url)
+        self.client.get("/api/posts/")
+        self.post.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get("/api/posts/").json()["count"], 0)
+
+    def test_other_posts_stay_cached(self):
+        other = Post.objects.create(
+            author=self.user, title="Other Post", text="Other Content"
+        )
+        self.client.get(f"/api/posts/{other.id}")
+        Comment.objects.create(
+            post=self.post, author=self.user, text="Another Comment"
+        )
+        with self.assertNumQueries(1):
+            self.client.get(f"/api/posts/{other.id}")
+
+    def test_authenticated_reads_bypass_cache(self):
+        self.client.get(self.url)
+        access = AccessToken.for_user(self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                self.url, HTTP_AUTHORIZATION=f"Bearer {access}"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_concurrent_miss_waits_for_rebuild(self):
+        key = entry_key(
+            POST_SCOPE.format(post_id=self.post.id),
+            RequestFactory().get(self.url)
+        )
+        cache.add(f"{key}:lock", 1)
+        rebuilt = threading.Timer(
+            0.1, cache.set,
+            args=(key, (b'{"rebuilt": true}', "application/json"))
+        )
+        rebuilt.start()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        rebuilt.join()
+        self.assertEqual(response.json(), {"rebuilt": True})
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_disabled_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
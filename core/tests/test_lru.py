@@ -0,0 +1,24 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.lru import LRUCache
+
+
+class LRUCacheTestCase(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", True)
+        cache.set("b", False)
+        cache.get("a")
+        cache.set("c", True)
+        self.assertIsNone(cache.get("b"))
+        self.assertTrue(cache.get("a"))
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entries_are_dropped(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        with mock.patch("core.lru.time.monotonic", return_value=0):
+            cache.set("a", True)
+        with mock.patch("core.lru.time.monotonic", return_value=61):
+            self.assertIsNone(cache.get("a"))
@@ -0,0 +1,72 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings
+)
+
+from core.metrics import (
+    RequestMetrics,
+    count,
+    current_metrics,
+    timed
+)
+from post.models import Post
+
+User = get_user_model()
+
+
+class RequestMetricsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        Post.objects.create(
+            author=self.user, title="Test Post", text="Test Content"
+        )
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1)
+    def test_sampled_request_is_measured(self):
+        with self.assertLogs("core.metrics", "INFO") as logs:
+            response = self.client.get("/api/posts/")
+
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "backend;dur=", "serialize;dur="):
+            self.assertIn(metric, timing)
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["path"], "/api/posts/")
+        self.assertEqual(line["status"], 200)
+        self.assertGreater(line["db_queries"], 0)
+        self.assertIn(f'desc="{line["db_queries"]} queries"', timing)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_unsampled_request_is_left_alone(self):
+        response = self.client.get("/api/posts/")
+        self.assertNotIn("Server-Timing", response)
+
+    def test_timed_adds_to_current_request(self):
+        with timed("backend"):
+            pass
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            with timed("backend"):
+                pass
+        finally:
+            current_metrics.reset(token)
+        self.assertGreater(metrics.backend, 0)
+
+    def test_count_adds_to_current_request(self):
+        count("backend_retries")
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            count("backend_retries")
+            count("backend_failures")
+        finally:
+            current_metrics.reset(token)
+        self.assertEqual(metrics.backend_retries, 1)
+        self.assertEqual(metrics.backend_failures, 1)
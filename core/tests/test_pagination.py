@@ -0,0 +1,116 @@
+from datetime import (
+    date,
+    datetime,
+    timedelta,
+    timezone
+)
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    RequestFactory,
+    TestCase
+)
+from ninja.errors import HttpError
+
+from comment.models import Comment
+from comment.stats import aggregate_daily_comments
+from core.pagination import CursorPagination
+from post.models import Post
+
+User = get_user_model()
+
+
+class CursorPaginationTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.posts = []
+        for number in range(7):
+            post = Post.objects.create(
+                author=self.user, title=f"Post {number}", text="Content"
+            )
+            # Pairs of posts share a timestamp, the id breaks the tie
+            post.created_at = created_at + timedelta(hours=number // 2)
+            post.save(update_fields=["created_at"])
+            self.posts.append(post)
+        self.request = RequestFactory().get("/")
+
+    def paginate(self, paginator, queryset, cursor=None):
+        return paginator.paginate_queryset(
+            queryset, CursorPagination.Input(cursor=cursor),
+            request=self.request
+        )
+
+    def test_walks_every_item_once_without_counting(self):
+        paginator = CursorPagination(page_size=3)
+        seen, cursor = [], None
+        for _ in range(3):
+            with self.assertNumQueries(1):
+                page = self.paginate(paginator, Post.objects.all(), cursor)
+            seen += [post.id for post in page["items"]]
+            cursor = page["next_cursor"]
+        self.assertIsNone(cursor)
+        self.assertEqual(
+            seen, [post.id for post in reversed(self.posts)]
+        )
+
+    def test_rows_apart_by_microseconds(self):
+        Post.objects.all().delete()
+        created_at = datetime(2024, 1, 1, 12, 0, 0, 1000, timezone.utc)
+        posts = []
+        for number in range(4):
+            post = Post.objects.create(
+                author=self.user, title=f"Post {number}", text="Content"
+            )
+            # All within one millisecond
+            post.created_at = created_at + timedelta(microseconds=number)
+            post.save(update_fields=["created_at"])
+            posts.append(post)
+
+        paginator = CursorPagination(page_size=2)
+        first = self.paginate(paginator, Post.objects.all())
+        second = self.paginate(
+            paginator, Post.objects.all(), first["next_cursor"]
+        )
+        self.assertEqual(
+            [post.id for post in first["items"] + second["items"]],
+            [post.id for post in reversed(posts)]
+        )
+
+    def test_hydrates_only_the_page(self):
+        paginator = CursorPagination(
+            page_size=2,
+            hydrate=lambda request, posts: [post.title for post in posts]
+        )
+        page = self.paginate(paginator, Post.objects.all())
+        self.assertEqual(page["items"], ["Post 6", "Post 5"])
+
+    def test_ascending_ordering_on_aggregated_rows(self):
+        for day in range(3):
+            comment = Comment.objects.create(
+                post=self.posts[0], author=self.user, text="Test Comment"
+            )
+            comment.created_at = datetime(2024, 1, 1 + day, 12,
+                                          tzinfo=timezone.utc)
+            comment.save(update_fields=["created_at"])
+        queryset = aggregate_daily_comments(
+            date(2024, 1, 1), date(2024, 1, 31)
+        )
+        paginator = CursorPagination(ordering=("date",), page_size=2)
+
+        first = self.paginate(paginator, queryset)
+        second = self.paginate(paginator, queryset, first["next_cursor"])
+        self.assertEqual(
+            [row["date"] for row in first["items"] + second["items"]],
+            [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)]
+        )
+        self.assertIsNone(second["next_cursor"])
+
+    def test_invalid_cursor(self):
+        paginator = CursorPagination(page_size=2)
+        for cursor in ("not a cursor", "WyJub3QgYSBkYXRlIiwgMV0"):
+            with self.assertRaises(HttpError) as error:
+                self.paginate(paginator, Post.objects.all(), cursor)
+            self.assertEqual(error.exception.status_code, 400)
@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.utils import timezone
+
+from comment.models import (
+    Comment,
+    CommentDailyStats
+)
+from core.models import ModerationStatus
+from core.tests.utils import blocked_when_marked
+from integrations.backends import (
+    BackendError,
+    get_moderation_backend
+)
+from integrations.resilience import moderation_breaker
+from post.models import Post
+
+User = get_user_model()
+
+
+@mock.patch(
+    "core.management.commands.remoderate.block_decisions",
+    side_effect=blocked_when_marked
+)
+class RemoderateCommandTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="blocked content"
+        )
+        self.kept = Comment.objects.create(
+            post=self.post, author=self.user, text="Kind comment",
+            moderation_status=ModerationStatus.PENDING
+        )
+        self.blocked = Comment.objects.create(
+            post=self.post, author=self.user, text="Now blocked comment"
+        )
+        self.unblocked = Comment.objects.create(
+            post=self.post, author=self.user, text="Fine comment",
+            is_blocked=True
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = os.path.join(directory.name, "checkpoint.json")
+
+    def remoderate(self, *args):
+        call_command(
+            "remoderate", "--chunk-size", "2",
+            "--checkpoint", self.checkpoint, *args, stdout=StringIO()
+        )
+
+    def test_verdicts_and_counters(self, block_decisions):
+        self.remoderate()
+
+        self.post.refresh_from_db()
+        self.assertTrue(self.post.is_blocked)
+        self.assertEqual(self.post.blocked_comment_count, 1)
+        blocked = dict(Comment.objects.values_list("id", "is_blocked"))
+        self.assertEqual(blocked, {
+            self.kept.id: False,
+            self.blocked.id: True,
+            self.unblocked.id: False,
+        })
+        self.assertFalse(Comment.objects.filter(
+            moderation_status=ModerationStatus.PENDING
+        ).exists())
+        stats = CommentDailyStats.objects.get(date=timezone.localdate())
+        self.assertEqual(stats.blocked_comments, 1)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resumes_after_checkpoint(self, block_decisions):
+        with open(self.checkpoint, "w") as checkpoint:
+            json.dump({
+                "version": get_moderation_backend().version,
+                "last_ids": {"comments": self.blocked.id}
+            }, checkpoint)
+
+        self.remoderate("--models", "comments")
+
+        block_decisions.assert_called_once_with(
+            ["Fine comment"], strict=True
+        )
+        self.blocked.refresh_from_db()
+        self.assertFalse(self.blocked.is_blocked)
+
+    def test_restart_ignores_checkpoint(self, block_decisions):
+        with open(self.checkpoint, "w") as checkpoint:
+            json.dump({
+                "version": get_moderation_backend().version,
+                "last_ids": {"comments": self.unblocked.id}
+            }, checkpoint)
+
+        self.remoderate("--models", "comments", "--restart")
+
+        self.blocked.refresh_from_db()
+        self.assertTrue(self.blocked.is_blocked)
+
+    def test_backend_error_keeps_checkpoint(self, block_decisions):
+        block_decisions.side_effect = [
+            [False, True], BackendError("unavailable")
+        ]
+
+        with self.assertRaises(CommandError):
+            self.remoderate("--models", "comments")
+
+        with open(self.checkpoint) as checkpoint:
+            last_ids = json.load(checkpoint)["last_ids"]
+        self.assertEqual(last_ids, {"comments": self.blocked.id})
+        self.unblocked.refresh_from_db()
+        self.assertTrue(self.unblocked.is_blocked)
+
+        block_decisions.side_effect = blocked_when_marked
+        self.remoderate("--models", "comments")
+        block_decisions.assert_called_with(["Fine comment"], strict=True)
+        self.unblocked.refresh_from_db()
+        self.assertFalse(self.unblocked.is_blocked)
+
+
+@override_settings(
+    MODERATION_BACKEND="integrations.backends.fake.FakeModerationBackend",
+    FAKE_BACKEND_ERROR_RATE=1,
+    FAKE_BACKEND_LATENCY=0,
+    MODERATION_PREFILTER_ENABLED=False,
+    BACKEND_RETRIES=0
+)
+class RemoderateOutageTestCase(TestCase):
+    def setUp(self):
+        moderation_breaker.reset()
+        self.addCleanup(moderation_breaker.reset)
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="Blocked content",
+            is_blocked=True
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.user, text="Blocked comment",
+            is_blocked=True
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = os.path.join(directory.name, "checkpoint.json")
+
+    def test_backend_failure_keeps_verdicts_and_checkpoint(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "remoderate", "--checkpoint", self.checkpoint,
+                stdout=StringIO()
+            )
+
+        self.post.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertTrue(self.post.is_blocked)
+        self.assertTrue(self.comment.is_blocked)
+        self.assertFalse(os.path.exists(self.checkpoint))
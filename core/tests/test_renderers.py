@@ -0,0 +1,52 @@
+import json
+from datetime import (
+    datetime,
+    timedelta,
+    timezone
+)
+from decimal import Decimal
+
+from django.test import (
+    RequestFactory,
+    SimpleTestCase
+)
+
+from core.renderers import (
+    ORJSONParser,
+    ORJSONRenderer
+)
+from user.schemas import UserSchema
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def render(self, data):
+        return json.loads(
+            ORJSONRenderer().render(None, data, response_status=200)
+        )
+
+    def test_renders_like_ninja(self):
+        created_at = datetime(2024, 1, 1, 12, 30, 15, 250000, timezone.utc)
+        rendered = self.render({
+            "created_at": created_at,
+            "reply_time": timedelta(minutes=5),
+            "author": UserSchema(id=1, username="user1", is_staff=False),
+            "price": Decimal("1.50"),
+        })
+        self.assertEqual(rendered, {
+            "created_at": "2024-01-01T12:30:15.250000Z",
+            "reply_time": "P0DT00H05M00S",
+            "author": {"id": 1, "username": "user1", "is_staff": False},
+            "price": "1.50",
+        })
+
+    def test_rejects_unknown_types(self):
+        with self.assertRaises(TypeError):
+            self.render({"value": object()})
+
+    def test_parser(self):
+        request = RequestFactory().post(
+            "/", '{"text": "New Comment"}', content_type="application/json"
+        )
+        self.assertEqual(
+            ORJSONParser().parse_body(request), {"text": "New Comment"}
+        )
@@ -0,0 +1,5 @@
+def blocked_when_marked(
+        texts: list[str], strict: bool = False
+) -> list[bool]:
+    """Stand-in for block_decisions, blocks the texts that say blocked"""
+    return ["blocked" in text for text in texts]
@@ -0,0 +1,29 @@
+from functools import cache
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from integrations.backends.base import (
+    BackendError,
+    ModerationBackend,
+    ReplyBackend
+)
+
+
+@cache
+def get_moderation_backend() -> ModerationBackend:
+    return import_string(settings.MODERATION_BACKEND)()
+
+
+@cache
+def get_reply_backend() -> ReplyBackend:
+    return import_string(settings.REPLY_BACKEND)()
+
+
+@receiver(setting_changed)
+def reset_backends(setting: str, **kwargs) -> None:
+    if setting.startswith(("MODERATION_BACKEND", "REPLY_BACKEND", "FAKE_")):
+        get_moderation_backend.cache_clear()
+        get_reply_backend.cache_clear()
@@ -0,0 +1,67 @@
+from abc import (
+    ABC,
+    abstractmethod
+)
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+
+class BackendError(Exception):
+    """Raised when a backend could not produce an answer"""
+
+    retryable = True
+
+    def __init__(self, message: str, retryable: bool | None = None) -> None:
+        super().__init__(message)
+        if retryable is not None:
+            self.retryable = retryable
+
+
+class Backend:
+    def __init__(self, timeout: float | None = None) -> None:
+        # Deadline of a single call in seconds
+        self.timeout = (
+            settings.BACKEND_TIMEOUT if timeout is None else timeout
+        )
+
+
+class ModerationBackend(Backend, ABC):
+    # Part of the verdict cache key: bump it whenever the backend
+    # may answer differently for the same text (e.g. a new prompt).
+    version = "1"
+
+    @abstractmethod
+    def moderate(self, text: str) -> bool:
+        """Return True if the text violates the rules"""
+
+    async def amoderate(self, text: str) -> bool:
+        """
+        Coroutine version of moderate, by default run in a worker
+        thread. Backends with a native async client override it.
+        """
+        return await sync_to_async(self.moderate, thread_sensitive=False)(
+            text
+        )
+
+    def moderate_many(self, texts: list[str]) -> list[bool] | None:
+        """
+        Return one verdict per text in a single round trip,
+        or None when the batched answer cannot be trusted.
+        """
+        return [self.moderate(text) for text in texts]
+
+
+class ReplyBackend(Backend, ABC):
+    @abstractmethod
+    def reply(self, post_text: str, comment_text: str) -> str:
+        """Return a reply of the post author to the comment"""
+
+    def reply_many(
+            self, post_text: str, comment_texts: list[str]
+    ) -> list[str] | None:
+        """
+        Return one reply per comment of the post in a single round
+        trip, or None when the batched answer cannot be trusted.
+        """
+        return [self.reply(post_text, text) for text in comment_texts]
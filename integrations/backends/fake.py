@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+
+from django.conf import settings
+
+from integrations.backends.base import (
+    BackendError,
+    ModerationBackend,
+    ReplyBackend
+)
+from integrations.cache import normalize_text
+
+
+class FakeBackend:
+    """
+    Offline stand-in for a remote model, used to load-test the API.
+    Every call sleeps for ``latency`` seconds (timing out past the call
+    deadline) and fails with probability ``error_rate``; the random
+    sequence is seeded, so runs repeat.
+    """
+
+    def __init__(
+            self, latency: float | None = None,
+            error_rate: float | None = None, seed: int = 0, **kwargs
+    ) -> None:
+        super().__init__(**kwargs)
+        self.latency = (
+            settings.FAKE_BACKEND_LATENCY if latency is None else latency
+        )
+        self.error_rate = (
+            settings.FAKE_BACKEND_ERROR_RATE
+            if error_rate is None else error_rate
+        )
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def simulate_call(self) -> None:
+        time.sleep(min(self.latency, self.timeout))
+        self._outcome()
+
+    async def asimulate_call(self) -> None:
+        await asyncio.sleep(min(self.latency, self.timeout))
+        self._outcome()
+
+    def _outcome(self) -> None:
+        if self.latency > self.timeout:
+            raise BackendError("Fake backend timed out")
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+        if failed:
+            raise BackendError("Fake backend error")
+
+
+class FakeModerationBackend(FakeBackend, ModerationBackend):
+    """Blocks a stable ``block_rate`` share of texts, picked by hash"""
+
+    version = "fake-1"
+
+    def __init__(self, block_rate: float | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.block_rate = (
+            settings.FAKE_BACKEND_BLOCK_RATE
+            if block_rate is None else block_rate
+        )
+
+    def moderate(self, text: str) -> bool:
+        self.simulate_call()
+        return self.verdict(text)
+
+    async def amoderate(self, text: str) -> bool:
+        await self.asimulate_call()
+        return self.verdict(text)
+
+    def moderate_many(self, texts: list[str]) -> list[bool] | None:
+        self.simulate_call()
+        return [self.verdict(text) for text in texts]
+
+    def verdict(self, text: str) -> bool:
+        digest = hashlib.sha256(normalize_text(text).encode()).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 < self.block_rate
+
+
+class FakeReplyBackend(FakeBackend, ReplyBackend):
+    def reply(self, post_text: str, comment_text: str) -> str:
+        self.simulate_call()
+        return self.answer(comment_text)
+
+    def reply_many(
+            self, post_text: str, comment_texts: list[str]
+    ) -> list[str] | None:
+        self.simulate_call()
+        return [self.answer(text) for text in comment_texts]
+
+    @staticmethod
+    def answer(comment_text: str) -> str:
+        return f"Thanks for your comment: {comment_text[:200]}"
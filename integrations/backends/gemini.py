@@ -0,0 +1,187 @@
+import json
+
+from django.conf import settings
+from google.api_core import exceptions as api_exceptions
+from google.auth.exceptions import GoogleAuthError
+import google.generativeai as genai
+from google.generativeai import GenerationConfig
+
+from integrations.backends.base import (
+    BackendError,
+    ModerationBackend,
+    ReplyBackend
+)
+
+BLOCK_DECISION_INSTRUCTION = (
+    "Answer ONLY True if there are any violations in "
+    "the text, the presence of foul language, mentioning "
+    "of bad words, etc, or False if not. "
+    "Please analyze the following text for violations:\n"
+)
+
+BATCH_DECISION_INSTRUCTION = (
+    "For EACH text of the following JSON array answer True if there "
+    "are any violations in the text, the presence of foul language, "
+    "mentioning of bad words, etc, or False if not. Answer ONLY with "
+    "a JSON array of booleans holding exactly one answer per text, "
+    "in the same order as the texts. Texts:\n"
+)
+
+REPLY_INSTRUCTION = (
+    "You are the author of the post and not an AI, make "
+    "a RESPONSE to the USER who commented on your post."
+    " Determine your tone based on the style of the comment "
+    "and its text.\n Post text: \n"
+)
+
+BATCH_REPLY_INSTRUCTION = (
+    "You are the author of the post and not an AI, make a RESPONSE "
+    "to EACH of the USERS who commented on your post. Determine the "
+    "tone of every response based on the style of its comment and "
+    "its text. Answer ONLY with a JSON array of strings holding "
+    "exactly one response per comment, in the same order as the "
+    "comments.\n Post text: \n"
+)
+
+
+class GeminiClient:
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        genai.configure(api_key=settings.GEMINI_SECRET_KEY)
+        self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
+
+    def generate(
+            self, prompt: str, response_schema: type | None = None
+    ) -> str:
+        try:
+            ai_response = self.model.generate_content(
+                **self._request(prompt, response_schema)
+            )
+            return self._response_text(ai_response)
+        except Exception as error:
+            raise self._backend_error(error)
+
+    async def agenerate(
+            self, prompt: str, response_schema: type | None = None
+    ) -> str:
+        try:
+            ai_response = await self.model.generate_content_async(
+                **self._request(prompt, response_schema)
+            )
+            return self._response_text(ai_response)
+        except Exception as error:
+            raise self._backend_error(error)
+
+    def _request(self, prompt: str, response_schema: type | None) -> dict:
+        config = None
+        if response_schema is not None:
+            config = GenerationConfig(
+                response_schema=response_schema,
+                response_mime_type="application/json"
+            )
+        return {
+            "contents": prompt,
+            "generation_config": config,
+            "request_options": {"timeout": self.timeout}
+        }
+
+    @staticmethod
+    def _response_text(ai_response) -> str:
+        candidate = ai_response.candidates[0]
+        if candidate.finish_reason.name == "SAFETY":
+            return "true"
+        return candidate.content.parts[0].text.strip()
+
+    @staticmethod
+    def _backend_error(error: Exception) -> BackendError:
+        return BackendError(
+            f"Gemini exception occurred: {error}",
+            retryable=is_retryable(error)
+        )
+
+
+class GeminiModerationBackend(GeminiClient, ModerationBackend):
+    # Bump whenever the moderation instructions change, so verdicts
+    # cached for the previous prompt are no longer served.
+    version = "gemini-1"
+
+    def moderate(self, text: str) -> bool:
+        return parse_decision(self.generate(
+            BLOCK_DECISION_INSTRUCTION + text, response_schema=bool
+        ))
+
+    async def amoderate(self, text: str) -> bool:
+        return parse_decision(await self.agenerate(
+            BLOCK_DECISION_INSTRUCTION + text, response_schema=bool
+        ))
+
+    def moderate_many(self, texts: list[str]) -> list[bool] | None:
+        prompt = BATCH_DECISION_INSTRUCTION + json.dumps(
+            texts, ensure_ascii=False
+        )
+        response_text = self.generate(prompt, response_schema=list[bool])
+        return parse_decisions(response_text, len(texts))
+
+
+class GeminiReplyBackend(GeminiClient, ReplyBackend):
+    def reply(self, post_text: str, comment_text: str) -> str:
+        return self.generate(
+            f"{REPLY_INSTRUCTION}{post_text}\nUser comment: \n{comment_text}"
+        )
+
+    def reply_many(
+            self, post_text: str, comment_texts: list[str]
+    ) -> list[str] | None:
+        prompt = (
+            f"{BATCH_REPLY_INSTRUCTION}{post_text}\nUser comments: \n"
+            + json.dumps(comment_texts, ensure_ascii=False)
+        )
+        response_text = self.generate(prompt, response_schema=list[str])
+        return parse_replies(response_text, len(comment_texts))
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rejected requests and missing credentials will not heal on retry"""
+    if isinstance(error, GoogleAuthError):
+        return False
+    if isinstance(error, api_exceptions.ClientError):
+        return isinstance(error, api_exceptions.TooManyRequests)
+    return True
+
+
+def parse_decision(response_text: str) -> bool:
+    if not response_text:
+        raise BackendError("Gemini returned an empty verdict")
+    return response_text.lower() == "true"
+
+
+def parse_decisions(
+        response_text: str | None, expected: int
+) -> list[bool] | None:
+    try:
+        decisions = json.loads(response_text)
+    except (TypeError, ValueError):
+        return None
+    if (
+            not isinstance(decisions, list)
+            or len(decisions) != expected
+            or not all(isinstance(item, bool) for item in decisions)
+    ):
+        return None
+    return decisions
+
+
+def parse_replies(
+        response_text: str | None, expected: int
+) -> list[str] | None:
+    try:
+        replies = json.loads(response_text)
+    except (TypeError, ValueError):
+        return None
+    if (
+            not isinstance(replies, list)
+            or len(replies) != expected
+            or not all(isinstance(item, str) for item in replies)
+    ):
+        return None
+    return replies
@@ -0,0 +1,22 @@
+from integrations.backends.base import (
+    ModerationBackend,
+    ReplyBackend
+)
+from integrations.prefilter import (
+    PrefilterVerdict,
+    prefilter
+)
+
+
+class LocalModerationBackend(ModerationBackend):
+    """Moderates with the lexicon prefilter only, unclear texts pass"""
+
+    version = "local-1"
+
+    def moderate(self, text: str) -> bool:
+        return prefilter.check(text) == PrefilterVerdict.BLOCK
+
+
+class LocalReplyBackend(ReplyBackend):
+    def reply(self, post_text: str, comment_text: str) -> str:
+        return "Thank you for your comment!"
@@ -0,0 +1,81 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor
+)
+from typing import Callable
+
+
+class BatchModerator:
+    """
+    Collects texts submitted by concurrent callers and moderates them
+    together: a batch is sent once it holds ``max_size`` texts or the
+    first text in it has waited ``window`` seconds. Each caller gets a
+    future resolved with the verdict of its own text.
+    """
+
+    def __init__(
+            self,
+            decide_many: Callable[[list[str]], list[bool]],
+            max_size: int, window: float, concurrency: int = 4
+    ) -> None:
+        self.decide_many = decide_many
+        self.max_size = max_size
+        self.window = window
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future
+
+    def decide(self, text: str, timeout: float | None = None) -> bool:
+        return self.submit(text).result(timeout=timeout)
+
+    def _ensure_worker(self) -> None:
+        # The collector thread does not survive a fork (Celery prefork,
+        # gunicorn), so each process starts its own on first use.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="moderation-batch"
+            )
+            threading.Thread(
+                target=self._collect, name="moderation-batcher", daemon=True
+            ).start()
+            self._pid = os.getpid()
+
+    def _collect(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._flush, batch)
+
+    def _flush(self, batch: list[tuple[str, Future]]) -> None:
+        try:
+            verdicts = self.decide_many([text for text, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        for (_, future), verdict in zip(batch, verdicts):
+            future.set_result(verdict)
@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Any
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from core.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "moderation:verdict:stats"
+COUNTERS = ("local_hits", "redis_hits", "misses")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.casefold().split())
+
+
+def verdict_key(text: str, version: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+    return f"moderation:verdict:{version}:{digest}"
+
+
+class VerdictCache:
+    """
+    Two-tier cache of moderation verdicts: an in-process LRU in front
+    of an optional shared Redis tier. Redis errors are treated as
+    misses so moderation keeps working when Redis is unavailable.
+    """
+
+    def __init__(
+            self, max_size: int, ttl: int,
+            redis_url: str | None = None,
+            stats_flush_every: int = 100
+    ) -> None:
+        self.ttl = ttl
+        self.local = LRUCache(max_size, ttl)
+        self.redis = (
+            redis.Redis.from_url(
+                redis_url, socket_timeout=0.1, socket_connect_timeout=0.1
+            )
+            if redis_url else None
+        )
+        self.stats_flush_every = stats_flush_every
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._unflushed = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def get(self, text: str, version: str) -> bool | None:
+        key = verdict_key(text, version)
+        verdict = self._get_local(key)
+        if verdict is None and self.redis is not None:
+            verdict = self._get_shared(key)
+        if verdict is None and self._count("misses"):
+            self.flush_stats()
+        return verdict
+
+    async def aget(self, text: str, version: str) -> bool | None:
+        """Like get, but keeps Redis round trips off the event loop"""
+        key = verdict_key(text, version)
+        verdict = self._get_local(key)
+        if verdict is None and self.redis is not None:
+            verdict = await sync_to_async(
+                self._get_shared, thread_sensitive=False
+            )(key)
+        if verdict is None and self._count("misses"):
+            await sync_to_async(self.flush_stats, thread_sensitive=False)()
+        return verdict
+
+    def set(self, text: str, version: str, verdict: bool) -> None:
+        key = verdict_key(text, version)
+        self.local.set(key, verdict)
+        if self.redis is not None:
+            self._set_shared(key, verdict)
+
+    async def aset(self, text: str, version: str, verdict: bool) -> None:
+        key = verdict_key(text, version)
+        self.local.set(key, verdict)
+        if self.redis is not None:
+            await sync_to_async(
+                self._set_shared, thread_sensitive=False
+            )(key, verdict)
+
+    def _get_local(self, key: str) -> bool | None:
+        verdict = self.local.get(key)
+        if verdict is not None:
+            self._count("local_hits")
+        return verdict
+
+    def _get_shared(self, key: str) -> bool | None:
+        try:
+            raw = self.redis.get(key)
+        except redis.RedisError as error:
+            logger.warning("Verdict cache read failed: %s", error)
+            return None
+        if raw is None:
+            return None
+        verdict = raw == b"1"
+        self.local.set(key, verdict)
+        if self._count("redis_hits"):
+            self.flush_stats()
+        return verdict
+
+    def _set_shared(self, key: str, verdict: bool) -> None:
+        try:
+            self.redis.set(key, int(verdict), ex=self.ttl)
+        except redis.RedisError as error:
+            logger.warning("Verdict cache write failed: %s", error)
+
+    def clear(self) -> None:
+        self.local.clear()
+        with self._lock:
+            self._counters = dict.fromkeys(COUNTERS, 0)
+            self._unflushed = dict.fromkeys(COUNTERS, 0)
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return _with_ratio(dict(self._counters))
+
+    def shared_stats(self) -> dict[str, int | float] | None:
+        """Counters aggregated in Redis across every process."""
+        if self.redis is None:
+            return None
+        self.flush_stats()
+        try:
+            raw = self.redis.hgetall(STATS_KEY)
+        except redis.RedisError as error:
+            logger.warning("Verdict cache stats read failed: %s", error)
+            return None
+        return _with_ratio({
+            name: int(raw.get(name.encode(), 0)) for name in COUNTERS
+        })
+
+    def flush_stats(self) -> None:
+        if self.redis is None:
+            return
+        with self._lock:
+            deltas = {
+                name: value for name, value in self._unflushed.items()
+                if value
+            }
+            self._unflushed = dict.fromkeys(COUNTERS, 0)
+        if not deltas:
+            return
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for name, value in deltas.items():
+                pipeline.hincrby(STATS_KEY, name, value)
+            pipeline.execute()
+        except redis.RedisError as error:
+            logger.warning("Verdict cache stats flush failed: %s", error)
+
+    def _count(self, name: str) -> bool:
+        """Count a lookup, return True once counters are due for a flush"""
+        with self._lock:
+            self._counters[name] += 1
+            self._unflushed[name] += 1
+            pending = sum(self._unflushed.values())
+        return self.redis is not None and pending >= self.stats_flush_every
+
+
+def _with_ratio(counters: dict[str, int]) -> dict[str, int | float]:
+    hits = counters["local_hits"] + counters["redis_hits"]
+    lookups = hits + counters["misses"]
+    counters["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+    return counters
+
+
+verdict_cache = VerdictCache(
+    max_size=settings.MODERATION_CACHE_SIZE,
+    ttl=settings.MODERATION_CACHE_TTL,
+    redis_url=settings.MODERATION_CACHE_REDIS_URL
+)
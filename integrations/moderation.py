@@ -0,0 +1,248 @@
+import asyncio
+import concurrent.futures
+import logging
+
+from django.conf import settings
+
+from core.metrics import timed
+from integrations.backends import (
+    BackendError,
+    get_moderation_backend,
+    get_reply_backend
+)
+from integrations.batching import BatchModerator
+from integrations.cache import (
+    verdict_cache,
+    verdict_key
+)
+from integrations.prefilter import (
+    PrefilterVerdict,
+    prefilter
+)
+from integrations.resilience import (
+    acall_with_retries,
+    call_with_retries,
+    moderation_breaker,
+    reply_breaker
+)
+
+logger = logging.getLogger(__name__)
+
+
+def block_decision(text: str) -> bool:
+    local_decision = prefilter_decision(text)
+    if local_decision is not None:
+        return local_decision
+    cached = verdict_cache.get(text, get_moderation_backend().version)
+    if cached is not None:
+        return cached
+    if settings.MODERATION_BATCH_ENABLED:
+        # The batch is sent from the batcher's thread, time the wait
+        with timed("backend"):
+            try:
+                return batch_moderator.decide(
+                    text, timeout=batch_timeout()
+                )
+            except concurrent.futures.TimeoutError:
+                return batch_timed_out()
+    return moderate_text(text)
+
+
+async def ablock_decision(text: str) -> bool:
+    """Coroutine version of block_decision for async views"""
+    local_decision = prefilter_decision(text)
+    if local_decision is not None:
+        return local_decision
+    cached = await verdict_cache.aget(text, get_moderation_backend().version)
+    if cached is not None:
+        return cached
+    if settings.MODERATION_BATCH_ENABLED:
+        with timed("backend"):
+            try:
+                # Shielded, the batcher resolves the future later on
+                return await asyncio.wait_for(
+                    asyncio.shield(
+                        asyncio.wrap_future(batch_moderator.submit(text))
+                    ),
+                    timeout=batch_timeout()
+                )
+            except asyncio.TimeoutError:
+                return batch_timed_out()
+    return await amoderate_text(text)
+
+
+def batch_timeout() -> float:
+    """
+    How long a caller waits for its batch: the batch window and the
+    deadline of the backend call the batch is sent in
+    """
+    return settings.BACKEND_DEADLINE + settings.MODERATION_BATCH_WINDOW
+
+
+def batch_timed_out() -> bool:
+    """
+    Verdict of a text whose batch is late, the backend is already past
+    its deadline so it is not asked again
+    """
+    logger.warning(
+        "Moderation batch timed out after %ss", batch_timeout()
+    )
+    return settings.MODERATION_DEFAULT_VERDICT
+
+
+def block_decisions(texts: list[str], strict: bool = False) -> list[bool]:
+    """
+    Moderate many texts, asking the backend about uncached ones at once.
+    With ``strict`` a backend failure raises BackendError instead of
+    answering MODERATION_DEFAULT_VERDICT.
+    """
+    version = get_moderation_backend().version
+    decisions = []
+    for text in texts:
+        decision = prefilter_decision(text)
+        if decision is None:
+            decision = verdict_cache.get(text, version)
+        decisions.append(decision)
+    missing = [
+        text for text, decision in zip(texts, decisions) if decision is None
+    ]
+    size = settings.MODERATION_BATCH_SIZE
+    fresh = iter([
+        decision
+        for start in range(0, len(missing), size)
+        for decision in moderate_texts(missing[start:start + size], strict)
+    ])
+    return [
+        next(fresh) if decision is None else decision
+        for decision in decisions
+    ]
+
+
+def prefilter_decision(text: str) -> bool | None:
+    """Verdict of the local lexicon prefilter, None when it is unsure"""
+    if not settings.MODERATION_PREFILTER_ENABLED:
+        return None
+    verdict = prefilter.check(text)
+    if verdict == PrefilterVerdict.UNSURE:
+        return None
+    return verdict == PrefilterVerdict.BLOCK
+
+
+def moderate_text(text: str, strict: bool = False) -> bool:
+    backend = get_moderation_backend()
+    try:
+        decision = call_with_retries(
+            moderation_breaker, backend.moderate, text
+        )
+    except BackendError as error:
+        logger.warning("Moderation failed: %s", error)
+        if strict:
+            raise
+        return settings.MODERATION_DEFAULT_VERDICT
+
+    verdict_cache.set(text, backend.version, decision)
+    return decision
+
+
+async def amoderate_text(text: str) -> bool:
+    backend = get_moderation_backend()
+    try:
+        decision = await acall_with_retries(
+            moderation_breaker, backend.amoderate, text
+        )
+    except BackendError as error:
+        logger.warning("Moderation failed: %s", error)
+        return settings.MODERATION_DEFAULT_VERDICT
+
+    await verdict_cache.aset(text, backend.version, decision)
+    return decision
+
+
+def moderate_texts(texts: list[str], strict: bool = False) -> list[bool]:
+    """
+    Moderate texts in a single backend round trip, falling back to one
+    call per text when the batched answer cannot be trusted. ``strict``
+    as in block_decisions.
+    """
+    backend = get_moderation_backend()
+    unique = {}
+    for text in texts:
+        unique.setdefault(verdict_key(text, backend.version), text)
+    keys = list(unique)
+
+    if len(keys) == 1:
+        decisions = [moderate_text(unique[keys[0]], strict)]
+    else:
+        try:
+            decisions = call_with_retries(
+                moderation_breaker, backend.moderate_many,
+                [unique[key] for key in keys]
+            )
+        except BackendError as error:
+            logger.warning("Batched moderation failed: %s", error)
+            decisions = None
+        if decisions is None:
+            decisions = [
+                moderate_text(unique[key], strict) for key in keys
+            ]
+        else:
+            for key, decision in zip(keys, decisions):
+                verdict_cache.set(unique[key], backend.version, decision)
+
+    by_key = dict(zip(keys, decisions))
+    return [by_key[verdict_key(text, backend.version)] for text in texts]
+
+
+batch_moderator = BatchModerator(
+    moderate_texts,
+    max_size=settings.MODERATION_BATCH_SIZE,
+    window=settings.MODERATION_BATCH_WINDOW
+)
+
+
+def response_to_comment(post_text: str, comment_text: str) -> str | None:
+    backend = get_reply_backend()
+    for _ in range(settings.REPLY_MAX_ATTEMPTS):
+        try:
+            response_text = call_with_retries(
+                reply_breaker, backend.reply, post_text, comment_text
+            )
+        except BackendError as error:
+            logger.warning("Reply generation failed: %s", error)
+            return None
+        reply = clean_reply(response_text)
+        if reply is not None:
+            return reply
+    return None
+
+
+def responses_to_comments(
+        post_text: str, comment_texts: list[str]
+) -> list[str | None]:
+    """
+    Replies to many comments of a post from a single backend round
+    trip, None for a comment whose reply is unusable. Unlike
+    moderate_texts there is no fallback to one call per comment, a
+    missing reply is not worth the quota.
+    """
+    if len(comment_texts) == 1:
+        return [response_to_comment(post_text, comment_texts[0])]
+
+    backend = get_reply_backend()
+    for _ in range(settings.REPLY_MAX_ATTEMPTS):
+        try:
+            replies = call_with_retries(
+                reply_breaker, backend.reply_many, post_text, comment_texts
+            )
+        except BackendError as error:
+            logger.warning("Batched reply generation failed: %s", error)
+            break
+        if replies is not None:
+            return [clean_reply(reply) for reply in replies]
+    return [None] * len(comment_texts)
+
+
+def clean_reply(response_text: str | None) -> str | None:
+    if response_text and len(response_text) <= 250:
+        return " ".join(response_text.split())
+    return None
@@ -0,0 +1,157 @@
+import re
+import unicodedata
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Iterable
+
+from django.conf import settings
+
+LEET_TABLE = str.maketrans({
+    "0": "o",
+    "1": "i",
+    "3": "e",
+    "4": "a",
+    "5": "s",
+    "7": "t",
+    "@": "a",
+    "$": "s",
+})
+REPEATED_CHARACTERS = re.compile(r"(.)\1+")
+NON_WORD_CHARACTERS = re.compile(r"[\W_]+")
+
+
+class PrefilterVerdict(str, Enum):
+    BLOCK = "block"
+    ALLOW = "allow"
+    UNSURE = "unsure"
+
+
+def normalize(text: str) -> str:
+    """
+    Fold a text to lowercase words separated by single spaces, undoing
+    leetspeak and squashing repeated letters ("fr33eee" -> "fre").
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = text.translate(LEET_TABLE)
+    text = NON_WORD_CHARACTERS.sub(" ", text)
+    text = REPEATED_CHARACTERS.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher, linear in the length of the text"""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.transitions: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[str | None] = [None]
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for character in pattern:
+            next_state = self.transitions[state].get(character)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.transitions[state][character] = next_state
+            state = next_state
+        self.output[state] = pattern
+
+    def _link(self) -> None:
+        pending = deque(self.transitions[0].values())
+        while pending:
+            state = pending.popleft()
+            for character, next_state in self.transitions[state].items():
+                pending.append(next_state)
+                fallback = self.fail[state]
+                while fallback and character not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(
+                    character, 0
+                )
+                if self.output[next_state] is None:
+                    # Inherit the match of the longest proper suffix
+                    self.output[next_state] = self.output[
+                        self.fail[next_state]
+                    ]
+
+    def first_match(self, text: str) -> str | None:
+        transitions, fail, output = self.transitions, self.fail, self.output
+        state = 0
+        for character in text:
+            while state and character not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(character, 0)
+            if output[state] is not None:
+                return output[state]
+        return None
+
+
+class Prefilter:
+    """
+    Decides clear cases locally: texts containing a blocklisted word are
+    blocked, short texts made only of allowlisted words are allowed and
+    everything else is left to the moderation model.
+
+    Blocklist entries match whole words; a trailing ``*`` also matches
+    any word starting with the entry ("spam*" matches "spammer").
+    """
+
+    def __init__(
+            self, blocklist: Iterable[str], allowlist: Iterable[str],
+            allow_max_words: int
+    ) -> None:
+        patterns = set()
+        for entry in blocklist:
+            prefix = entry.endswith("*")
+            word = normalize(entry.rstrip("*"))
+            if word:
+                patterns.add(f" {word}" if prefix else f" {word} ")
+        self.automaton = AhoCorasick(sorted(patterns))
+        self.allowlist = {normalize(word) for word in allowlist}
+        self.allow_max_words = allow_max_words
+
+    @classmethod
+    def from_files(
+            cls, blocklist_path: Path, allowlist_path: Path,
+            allow_max_words: int
+    ) -> "Prefilter":
+        return cls(
+            read_word_list(blocklist_path),
+            read_word_list(allowlist_path),
+            allow_max_words
+        )
+
+    def check(self, text: str) -> PrefilterVerdict:
+        normalized = normalize(text)
+        if self.automaton.first_match(f" {normalized} ") is not None:
+            return PrefilterVerdict.BLOCK
+        words = normalized.split()
+        if (
+                words
+                and len(words) <= self.allow_max_words
+                and all(word in self.allowlist for word in words)
+        ):
+            return PrefilterVerdict.ALLOW
+        return PrefilterVerdict.UNSURE
+
+
+def read_word_list(path: Path) -> list[str]:
+    with open(path, encoding="utf-8") as file:
+        return [
+            line.strip() for line in file
+            if line.strip() and not line.startswith("#")
+        ]
+
+
+prefilter = Prefilter.from_files(
+    settings.MODERATION_BLOCKLIST_PATH,
+    settings.MODERATION_ALLOWLIST_PATH,
+    settings.MODERATION_PREFILTER_ALLOW_MAX_WORDS
+)
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import (
+    Any,
+    Callable
+)
+
+from django.conf import settings
+
+from core.metrics import (
+    count,
+    timed
+)
+from integrations.backends import BackendError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(BackendError):
+    retryable = False
+
+
+class CircuitBreaker:
+    """
+    Stops calling a backend after ``failure_threshold`` consecutive
+    failures. Calls then fail fast for ``reset_timeout`` seconds, after
+    which a single trial call decides whether the circuit closes again.
+    Only transient failures count, a backend that rejected a request it
+    cannot serve (bad input, bad key) still answered.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+            self, name: str, failure_threshold: int, reset_timeout: float
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.counters = {
+            "calls": 0, "failures": 0, "client_errors": 0,
+            "rejected": 0, "retries": 0, "opened": 0
+        }
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable, *args: Any) -> Any:
+        self._before_call()
+        try:
+            result = func(*args)
+        except Exception as error:
+            self._on_failure(error)
+            raise
+        except BaseException:
+            # Cancelled (e.g. the client went away), says nothing
+            # about the backend but must not hold the trial slot
+            self._on_abandoned()
+            raise
+        self._on_success()
+        return result
+
+    async def acall(self, func: Callable, *args: Any) -> Any:
+        self._before_call()
+        try:
+            result = await func(*args)
+        except Exception as error:
+            self._on_failure(error)
+            raise
+        except BaseException:
+            # Cancelled (e.g. the client went away), says nothing
+            # about the backend but must not hold the trial slot
+            self._on_abandoned()
+            raise
+        self._on_success()
+        return result
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, **self.counters}
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.counters["retries"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.counters = dict.fromkeys(self.counters, 0)
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.counters["rejected"] += 1
+                    raise CircuitOpenError(f"{self.name} circuit is open")
+                self._set_state(self.HALF_OPEN)
+            elif self.state == self.HALF_OPEN:
+                # A trial call is already in flight
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(f"{self.name} circuit is half open")
+            self.counters["calls"] += 1
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def _on_failure(self, error: Exception) -> None:
+        if not getattr(error, "retryable", True):
+            with self._lock:
+                self.counters["client_errors"] += 1
+            self._on_success()
+            return
+        count("backend_failures")
+        with self._lock:
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if (
+                    self.state == self.HALF_OPEN
+                    or self.consecutive_failures >= self.failure_threshold
+            ):
+                self.opened_at = time.monotonic()
+                self.counters["opened"] += 1
+                self._set_state(self.OPEN)
+
+    def _on_abandoned(self) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # Back to open with the timeout elapsed, the next call
+                # makes a new trial
+                self.opened_at = time.monotonic() - self.reset_timeout
+                self._set_state(self.OPEN)
+
+    def _set_state(self, state: str) -> None:
+        logger.warning(
+            "Circuit %s: %s -> %s %s",
+            self.name, self.state, state, self.counters
+        )
+        self.state = state
+
+
+def call_with_retries(
+        breaker: CircuitBreaker, func: Callable, *args: Any
+) -> Any:
+    """
+    Call ``func`` through the breaker, retrying retryable failures with
+    capped exponential backoff as long as the overall deadline allows.
+    """
+    deadline = time.monotonic() + settings.BACKEND_DEADLINE
+    with timed("backend"):
+        for attempt in range(settings.BACKEND_RETRIES + 1):
+            try:
+                return breaker.call(func, *args)
+            except BackendError as error:
+                time.sleep(_retry_delay(breaker, error, attempt, deadline))
+
+
+async def acall_with_retries(
+        breaker: CircuitBreaker, func: Callable, *args: Any
+) -> Any:
+    """Coroutine version of call_with_retries for async backends"""
+    deadline = time.monotonic() + settings.BACKEND_DEADLINE
+    with timed("backend"):
+        for attempt in range(settings.BACKEND_RETRIES + 1):
+            try:
+                return await breaker.acall(func, *args)
+            except BackendError as error:
+                await asyncio.sleep(
+                    _retry_delay(breaker, error, attempt, deadline)
+                )
+
+
+def _retry_delay(
+        breaker: CircuitBreaker, error: BackendError,
+        attempt: int, deadline: float
+) -> float:
+    """Backoff before the next attempt, re-raises when giving up"""
+    if not error.retryable or attempt == settings.BACKEND_RETRIES:
+        raise error
+    delay = min(
+        settings.BACKEND_RETRY_MAX_BACKOFF,
+        settings.BACKEND_RETRY_BACKOFF * 2 ** attempt
+    ) * random.uniform(0.5, 1)
+    if time.monotonic() + delay >= deadline:
+        raise error
+    breaker.record_retry()
+    count("backend_retries")
+    logger.info("Retrying %s call in %.2fs: %s", breaker.name, delay, error)
+    return delay
+
+
+def metrics() -> dict[str, dict[str, Any]]:
+    return {
+        breaker.name: breaker.metrics()
+        for breaker in (moderation_breaker, reply_breaker)
+    }
+
+
+moderation_breaker = CircuitBreaker(
+    "moderation",
+    failure_threshold=settings.BACKEND_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.BACKEND_CIRCUIT_RESET_TIMEOUT
+)
+
+reply_breaker = CircuitBreaker(
+    "reply",
+    failure_threshold=settings.BACKEND_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.BACKEND_CIRCUIT_RESET_TIMEOUT
+)
@@ -1,13 +1,43 @@
+import logging
+import math
+from collections import defaultdict
+from datetime import (
+    datetime,
+    timedelta,
+    timezone as dt_timezone
+)
+
 from celery import shared_task
-from comment.models import Comment
-from integrations.gemini import response_to_comment
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from comment.models import (
+    Comment,
+    ScheduledReply
+)
+from core.models import ModerationStatus
+from integrations.moderation import (
+    block_decision,
+    response_to_comment,
+    responses_to_comments
+)
+from post.models import Post
+
+logger = logging.getLogger(__name__)
 
 
+# auto_reply_to_comment(s) only drain the delayed tasks queued before
+# replies were scheduled in the ScheduledReply table
+
 @shared_task
 def auto_reply_to_comment(comment_id: int) -> None:
     try:
         comment = Comment.objects.get(id=comment_id)
         reply = response_to_comment(comment.post.text, comment.text)
+        if reply is None:
+            return
         new_comment = Comment(
             post=comment.post,
             author=comment.post.author,
@@ -17,3 +47,194 @@ def auto_reply_to_comment(comment_id: int) -> None:
         new_comment.save()
     except Comment.DoesNotExist:
         pass
+
+
+@shared_task
+def auto_reply_to_comments(comment_ids: list[int]) -> None:
+    for comment_id in comment_ids:
+        auto_reply_to_comment(comment_id)
+
+
+@shared_task
+def send_due_replies() -> None:
+    """
+    Periodic task replying to the comments whose reply time has come,
+    a batch of ScheduledReply rows at a time. The rows are leased in a
+    short transaction, so concurrent sweeps skip them, and the backend
+    is called outside of any transaction. Replies the backend could not
+    produce are put back for a later sweep.
+    """
+    batch_size = settings.REPLY_SWEEP_BATCH_SIZE
+    while True:
+        due = claim_due_replies(batch_size)
+        if not due:
+            return
+        if settings.REPLY_COALESCE_ENABLED:
+            answers = coalesced_replies(due)
+        else:
+            answers = [
+                (scheduled, response_to_comment(
+                    scheduled.comment.post.text, scheduled.comment.text
+                ))
+                for scheduled in due
+            ]
+        for scheduled, text in answers:
+            if text is None:
+                retry_reply(scheduled)
+            else:
+                send_reply(scheduled, text)
+        if len(due) < batch_size:
+            return
+
+
+def claim_due_replies(limit: int) -> list[ScheduledReply]:
+    """
+    Lease due rows to the calling sweep for REPLY_SWEEP_LEASE seconds,
+    the rows of a sweep that died are picked up once the lease ends.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = list(
+            ScheduledReply.objects
+            .select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+                due_at__lte=now
+            )
+            .select_related("comment__post")
+            .order_by("due_at", "id")[:limit]
+        )
+        ScheduledReply.objects.filter(
+            id__in=[scheduled.id for scheduled in due]
+        ).update(
+            claimed_until=now + timedelta(seconds=settings.REPLY_SWEEP_LEASE)
+        )
+    return due
+
+
+def reply_due_at(created_at: datetime, reply_time: timedelta) -> datetime:
+    """
+    When the auto-reply to a comment is due. With REPLY_COALESCE_ENABLED
+    the time is rounded up to the end of a REPLY_COALESCE_WINDOW, so the
+    comments of a post share a due time and one backend call.
+    """
+    due_at = created_at + reply_time
+    if not settings.REPLY_COALESCE_ENABLED:
+        return due_at
+    window = settings.REPLY_COALESCE_WINDOW
+    window_end = math.ceil(due_at.timestamp() / window) * window
+    return datetime.fromtimestamp(window_end, tz=dt_timezone.utc)
+
+
+def coalesced_replies(
+        due: list[ScheduledReply]
+) -> list[tuple[ScheduledReply, str | None]]:
+    """
+    Answer the due comments of a post with a single backend call. Past
+    REPLY_COALESCE_MAX_PER_POST replies per post and window the
+    remaining comments are left without one and their rows deleted.
+    """
+    groups = defaultdict(list)
+    for scheduled in due:
+        groups[scheduled.comment.post_id].append(scheduled)
+
+    limit = settings.REPLY_COALESCE_MAX_PER_POST
+    answers = []
+    for rows in groups.values():
+        allowed = max(limit - recent_replies(rows[0].comment.post), 0)
+        ScheduledReply.objects.filter(
+            id__in=[scheduled.id for scheduled in rows[allowed:]]
+        ).delete()
+        rows = rows[:allowed]
+        if not rows:
+            continue
+        texts = responses_to_comments(
+            rows[0].comment.post.text,
+            [scheduled.comment.text for scheduled in rows]
+        )
+        answers.extend(zip(rows, texts))
+    return answers
+
+
+def recent_replies(post: Post) -> int:
+    """
+    Replies of the post's author on it within the last
+    REPLY_COALESCE_WINDOW, what the per-post reply cap is checked against
+    """
+    since = timezone.now() - timedelta(
+        seconds=settings.REPLY_COALESCE_WINDOW
+    )
+    return Comment.objects.filter(
+        post_id=post.id, author_id=post.author_id,
+        parent__isnull=False, created_at__gte=since
+    ).count()
+
+
+def send_reply(scheduled: ScheduledReply, text: str) -> None:
+    """Insert the reply and retire its scheduled row together"""
+    comment = scheduled.comment
+    with transaction.atomic():
+        deleted, _ = ScheduledReply.objects.filter(id=scheduled.id).delete()
+        # Gone when the comment was deleted meanwhile, or when another
+        # sweep took the row over after this one's lease ran out
+        if not deleted:
+            return
+        if settings.REPLY_COALESCE_ENABLED:
+            # The post's row lock orders the cap checks of sweeps
+            # replying on the same post at once
+            post = Post.objects.select_for_update().get(id=comment.post_id)
+            if recent_replies(post) >= settings.REPLY_COALESCE_MAX_PER_POST:
+                return
+        Comment(
+            post=comment.post,
+            author_id=comment.post.author_id,
+            text=text,
+            parent=comment
+        ).save()
+
+
+def retry_reply(scheduled: ScheduledReply) -> None:
+    """
+    Release the lease of a reply the backend did not produce (outage,
+    open circuit) and schedule it again after a delay doubling with
+    every attempt, the row is dropped after REPLY_SEND_ATTEMPTS
+    """
+    attempts = scheduled.attempts + 1
+    rows = ScheduledReply.objects.filter(id=scheduled.id)
+    if attempts >= settings.REPLY_SEND_ATTEMPTS:
+        logger.warning(
+            "No reply to comment %s after %s attempts, giving up",
+            scheduled.comment_id, attempts
+        )
+        rows.delete()
+        return
+    delay = settings.REPLY_RETRY_DELAY * 2 ** (attempts - 1)
+    rows.update(
+        attempts=attempts,
+        claimed_until=None,
+        due_at=timezone.now() + timedelta(seconds=delay)
+    )
+
+
+@shared_task
+def moderate_comment(comment_id: int) -> None:
+    try:
+        comment = Comment.objects.get(id=comment_id)
+    except Comment.DoesNotExist:
+        return
+    comment.is_blocked = block_decision(comment.text)
+    comment.moderation_status = ModerationStatus.MODERATED
+    comment.save(update_fields=["is_blocked", "moderation_status"])
+
+
+@shared_task
+def moderate_post(post_id: int) -> None:
+    try:
+        post = Post.objects.get(id=post_id)
+    except Post.DoesNotExist:
+        return
+    post.is_blocked = block_decision(post.title + post.text)
+    post.moderation_status = ModerationStatus.MODERATED
+    post.save(
+        update_fields=["is_blocked", "moderation_status", "updated_at"]
+    )
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.test import (
+    SimpleTestCase,
+    override_settings
+)
+
+from integrations.backends import (
+    BackendError,
+    get_moderation_backend,
+    get_reply_backend
+)
+from integrations.backends.fake import (
+    FakeModerationBackend,
+    FakeReplyBackend
+)
+from integrations.backends.gemini import (
+    parse_decisions,
+    parse_replies
+)
+from integrations.backends.local import LocalModerationBackend
+
+
+@override_settings(
+    MODERATION_BACKEND="integrations.backends.fake.FakeModerationBackend",
+    REPLY_BACKEND="integrations.backends.fake.FakeReplyBackend"
+)
+class BackendSelectionTestCase(SimpleTestCase):
+    def test_backends_come_from_settings(self):
+        self.assertIsInstance(get_moderation_backend(), FakeModerationBackend)
+        self.assertIsInstance(get_reply_backend(), FakeReplyBackend)
+        self.assertIs(get_moderation_backend(), get_moderation_backend())
+
+    def test_local_backend(self):
+        with self.settings(
+                MODERATION_BACKEND=(
+                    "integrations.backends.local.LocalModerationBackend"
+                )
+        ):
+            backend = get_moderation_backend()
+        self.assertIsInstance(backend, LocalModerationBackend)
+        self.assertTrue(backend.moderate("sh1t"))
+        self.assertFalse(backend.moderate("a perfectly normal remark"))
+
+
+class FakeBackendTestCase(SimpleTestCase):
+    def test_verdicts_are_deterministic(self):
+        texts = [f"comment number {number}" for number in range(1000)]
+        first = FakeModerationBackend(block_rate=0.2).moderate_many(texts)
+        second = [
+            FakeModerationBackend(block_rate=0.2).moderate(text)
+            for text in texts
+        ]
+        self.assertEqual(first, second)
+        self.assertAlmostEqual(sum(first) / len(texts), 0.2, delta=0.05)
+
+    def test_error_rate(self):
+        backend = FakeModerationBackend(error_rate=1)
+        with self.assertRaises(BackendError):
+            backend.moderate("text")
+        self.assertTrue(FakeReplyBackend(error_rate=0).reply("post", "hi"))
+
+    @mock.patch("integrations.backends.fake.time.sleep")
+    def test_latency(self, sleep):
+        FakeModerationBackend(latency=0.25).moderate("text")
+        sleep.assert_called_once_with(0.25)
+
+
+class ParseDecisionsTestCase(SimpleTestCase):
+    def test_parse_decisions(self):
+        self.assertEqual(parse_decisions("[true, false]", 2), [True, False])
+        for answer in ("[true]", "true", "[1, 0]", "not json", None):
+            self.assertIsNone(parse_decisions(answer, 2), answer)
+
+    def test_parse_replies(self):
+        self.assertEqual(
+            parse_replies('["Thanks!", "Agreed"]', 2), ["Thanks!", "Agreed"]
+        )
+        for answer in ('["Thanks!"]', '"Thanks!"', "[1, 2]", None):
+            self.assertIsNone(parse_replies(answer, 2), answer)
@@ -0,0 +1,102 @@
+import concurrent.futures
+from unittest import mock
+
+from django.test import (
+    SimpleTestCase,
+    override_settings
+)
+
+from integrations import moderation
+from integrations.batching import BatchModerator
+from integrations.cache import verdict_cache
+
+
+class BatchModeratorTestCase(SimpleTestCase):
+    def test_concurrent_texts_share_one_call(self):
+        decide_many = mock.Mock(side_effect=lambda texts: [
+            text == "bad" for text in texts
+        ])
+        moderator = BatchModerator(decide_many, max_size=3, window=5)
+
+        futures = [moderator.submit(text) for text in ("ok", "bad", "fine")]
+
+        self.assertEqual(
+            [future.result(timeout=5) for future in futures],
+            [False, True, False]
+        )
+        decide_many.assert_called_once_with(["ok", "bad", "fine"])
+
+    def test_errors_reach_every_caller(self):
+        moderator = BatchModerator(
+            mock.Mock(side_effect=RuntimeError("quota")),
+            max_size=2, window=5
+        )
+        futures = [moderator.submit("a"), moderator.submit("b")]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+
+class BlockDecisionsTestCase(SimpleTestCase):
+    def setUp(self):
+        verdict_cache.clear()
+        self.backend = mock.Mock(version="test")
+        patcher = mock.patch.object(
+            moderation, "get_moderation_backend", return_value=self.backend
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_uncached_texts_are_sent_in_one_call(self):
+        verdict_cache.set("cached", "test", True)
+        self.backend.moderate_many.return_value = [False, True]
+
+        decisions = moderation.block_decisions(
+            ["first", "cached", "second", "First"]
+        )
+
+        self.assertEqual(decisions, [False, True, True, False])
+        self.backend.moderate_many.assert_called_once_with(
+            ["first", "second"]
+        )
+
+    def test_malformed_answer_falls_back_to_single_calls(self):
+        self.backend.moderate_many.return_value = None
+        self.backend.moderate.side_effect = [True, False]
+
+        decisions = moderation.block_decisions(["first", "second"])
+
+        self.assertEqual(decisions, [True, False])
+        self.assertEqual(self.backend.moderate.call_count, 2)
+
+    @override_settings(MODERATION_BATCH_ENABLED=True)
+    def test_block_decision_goes_through_batcher(self):
+        with mock.patch.object(
+                moderation.batch_moderator, "decide", return_value=True
+        ) as decide:
+            self.assertTrue(moderation.block_decision("some text"))
+        decide.assert_called_once_with(
+            "some text", timeout=moderation.batch_timeout()
+        )
+
+    @override_settings(
+        MODERATION_BATCH_ENABLED=True, MODERATION_DEFAULT_VERDICT=True
+    )
+    def test_late_batch_answers_default_verdict(self):
+        with mock.patch.object(
+                moderation.batch_moderator, "decide",
+                side_effect=concurrent.futures.TimeoutError
+        ):
+            self.assertTrue(moderation.block_decision("some text"))
+        self.backend.moderate.assert_not_called()
+
+    @override_settings(
+        MODERATION_BATCH_ENABLED=True, MODERATION_DEFAULT_VERDICT=True,
+        BACKEND_DEADLINE=0
+    )
+    async def test_late_batch_answers_default_verdict_async(self):
+        with mock.patch.object(
+                moderation.batch_moderator, "submit",
+                return_value=concurrent.futures.Future()
+        ):
+            self.assertTrue(await moderation.ablock_decision("some text"))
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from integrations import moderation
+from integrations.backends import BackendError
+from integrations.resilience import moderation_breaker
+from integrations.cache import (
+    VerdictCache,
+    verdict_key,
+    verdict_cache
+)
+
+
+class VerdictCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        verdict_cache.clear()
+        moderation_breaker.reset()
+        self.backend = mock.Mock(version="test")
+        patcher = mock.patch.object(
+            moderation, "get_moderation_backend", return_value=self.backend
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_ignores_case_and_whitespace(self):
+        self.assertEqual(
+            verdict_key("Great   post!!", "1"),
+            verdict_key(" great post!! ", "1")
+        )
+        self.assertNotEqual(
+            verdict_key("great post!!", "1"),
+            verdict_key("great post!!", "2")
+        )
+
+    def test_counts_hits_and_misses(self):
+        cache = VerdictCache(max_size=10, ttl=60)
+        self.assertIsNone(cache.get("text", "1"))
+        cache.set("text", "1", True)
+        self.assertTrue(cache.get("text", "1"))
+        stats = cache.stats()
+        self.assertEqual(stats["local_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_block_decision_calls_backend_once_per_text(self):
+        self.backend.moderate.return_value = True
+        self.assertTrue(moderation.block_decision("Spam spam spam"))
+        self.assertTrue(moderation.block_decision("spam SPAM spam"))
+        self.backend.moderate.assert_called_once()
+
+    def test_failed_calls_are_not_cached(self):
+        self.backend.moderate.side_effect = BackendError(
+            "unavailable", retryable=False
+        )
+        self.assertFalse(moderation.block_decision("Some text"))
+        self.assertFalse(moderation.block_decision("Some text"))
+        self.assertEqual(self.backend.moderate.call_count, 2)
+
+    async def test_ablock_decision_shares_the_cache(self):
+        self.backend.amoderate = mock.AsyncMock(return_value=True)
+        self.assertTrue(await moderation.ablock_decision("Spam spam spam"))
+        self.assertTrue(moderation.block_decision("spam SPAM spam"))
+        self.backend.amoderate.assert_awaited_once()
+        self.backend.moderate.assert_not_called()
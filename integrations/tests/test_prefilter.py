@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from integrations import moderation
+from integrations.prefilter import (
+    AhoCorasick,
+    Prefilter,
+    PrefilterVerdict,
+    normalize
+)
+
+
+class AhoCorasickTestCase(SimpleTestCase):
+    def test_finds_overlapping_patterns(self):
+        automaton = AhoCorasick(["he", "she", "hers"])
+        self.assertEqual(automaton.first_match("ushers"), "she")
+        self.assertEqual(automaton.first_match("ahem"), "he")
+        self.assertIsNone(automaton.first_match("history"))
+
+
+class PrefilterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.prefilter = Prefilter(
+            blocklist=["darn*", "heck", "go away"],
+            allowlist=["great", "post", "thanks"],
+            allow_max_words=3
+        )
+
+    def test_normalize_folds_leetspeak_and_repeats(self):
+        self.assertEqual(normalize("D4RRRN  it!!"), "darn it")
+
+    def test_blocks_obfuscated_words(self):
+        for text in ("H3CK!", "daaarn it", "d4rnit all", "please GO, away"):
+            self.assertEqual(
+                self.prefilter.check(text), PrefilterVerdict.BLOCK, text
+            )
+
+    def test_matches_whole_words_only(self):
+        self.assertEqual(
+            self.prefilter.check("checking the heckle"),
+            PrefilterVerdict.UNSURE
+        )
+
+    def test_allows_short_harmless_texts(self):
+        self.assertEqual(
+            self.prefilter.check("Great post, thanks!!!"),
+            PrefilterVerdict.ALLOW
+        )
+        self.assertEqual(
+            self.prefilter.check("great great great great"),
+            PrefilterVerdict.UNSURE
+        )
+
+    def test_clear_cases_skip_backend(self):
+        with mock.patch.object(
+                moderation, "get_moderation_backend"
+        ) as get_backend:
+            self.assertTrue(moderation.block_decision("what the fuuuck"))
+            self.assertFalse(moderation.block_decision("Great post, thanks!"))
+            self.assertEqual(
+                moderation.block_decisions(["sh1t", "nice"]), [True, False]
+            )
+        get_backend.return_value.moderate.assert_not_called()
+        get_backend.return_value.moderate_many.assert_not_called()
@@ -0,0 +1,189 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings
+)
+from ninja_jwt.tokens import AccessToken
+
+from integrations import moderation
+from integrations.backends import BackendError
+from integrations.cache import verdict_cache
+from integrations.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    acall_with_retries,
+    call_with_retries,
+    moderation_breaker,
+    reply_breaker
+)
+
+
+def fail():
+    raise BackendError("unavailable")
+
+
+class CircuitBreakerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            "test", failure_threshold=2, reset_timeout=30
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            with self.assertRaises(BackendError):
+                self.breaker.call(fail)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(lambda: True)
+        self.assertEqual(self.breaker.metrics()["state"], "open")
+        self.assertEqual(self.breaker.metrics()["rejected"], 1)
+
+    def test_rejected_requests_keep_circuit_closed(self):
+        def reject():
+            raise BackendError("bad request", retryable=False)
+
+        for _ in range(3):
+            with self.assertRaises(BackendError):
+                self.breaker.call(reject)
+        self.assertTrue(self.breaker.call(lambda: True))
+        metrics = self.breaker.metrics()
+        self.assertEqual(metrics["state"], "closed")
+        self.assertEqual(metrics["failures"], 0)
+        self.assertEqual(metrics["client_errors"], 3)
+
+    def test_trial_call_closes_circuit(self):
+        for _ in range(2):
+            with self.assertRaises(BackendError):
+                self.breaker.call(fail)
+        with mock.patch(
+                "integrations.resilience.time.monotonic",
+                return_value=self.breaker.opened_at + 31
+        ):
+            self.assertTrue(self.breaker.call(lambda: True))
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_cancelled_trial_frees_the_circuit(self):
+        async def cancelled():
+            raise asyncio.CancelledError
+
+        async def answer():
+            return True
+
+        for _ in range(2):
+            with self.assertRaises(BackendError):
+                self.breaker.call(fail)
+        with mock.patch(
+                "integrations.resilience.time.monotonic",
+                return_value=self.breaker.opened_at + 31
+        ):
+            with self.assertRaises(asyncio.CancelledError):
+                await self.breaker.acall(cancelled)
+            self.assertTrue(await self.breaker.acall(answer))
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+@override_settings(
+    BACKEND_RETRIES=2, BACKEND_RETRY_BACKOFF=1,
+    BACKEND_RETRY_MAX_BACKOFF=1.5, BACKEND_DEADLINE=60
+)
+@mock.patch("integrations.resilience.time.sleep")
+class RetriesTestCase(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            "test", failure_threshold=10, reset_timeout=30
+        )
+
+    def test_retries_with_capped_backoff(self, sleep):
+        func = mock.Mock(side_effect=[
+            BackendError("first"), BackendError("second"), "answer"
+        ])
+        self.assertEqual(call_with_retries(self.breaker, func), "answer")
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertTrue(0.5 <= delays[0] <= 1)
+        self.assertTrue(0.75 <= delays[1] <= 1.5)
+        self.assertEqual(self.breaker.metrics()["retries"], 2)
+
+    def test_gives_up_after_last_attempt(self, sleep):
+        func = mock.Mock(side_effect=BackendError("down"))
+        with self.assertRaises(BackendError):
+            call_with_retries(self.breaker, func)
+        self.assertEqual(func.call_count, 3)
+
+    def test_permanent_errors_are_not_retried(self, sleep):
+        func = mock.Mock(side_effect=BackendError("bad key", retryable=False))
+        with self.assertRaises(BackendError):
+            call_with_retries(self.breaker, func)
+        func.assert_called_once()
+        sleep.assert_not_called()
+
+    @mock.patch("integrations.resilience.asyncio.sleep")
+    async def test_async_retries(self, async_sleep, sleep):
+        func = mock.AsyncMock(side_effect=[BackendError("first"), "answer"])
+        self.assertEqual(
+            await acall_with_retries(self.breaker, func), "answer"
+        )
+        async_sleep.assert_awaited_once()
+        sleep.assert_not_called()
+
+
+@override_settings(BACKEND_RETRIES=0, MODERATION_PREFILTER_ENABLED=False)
+class DegradedBackendTestCase(SimpleTestCase):
+    def setUp(self):
+        verdict_cache.clear()
+        moderation_breaker.reset()
+        reply_breaker.reset()
+        self.addCleanup(moderation_breaker.reset)
+        self.addCleanup(reply_breaker.reset)
+
+    @override_settings(MODERATION_DEFAULT_VERDICT=True)
+    def test_open_circuit_returns_default_verdict(self):
+        backend = mock.Mock(version="test")
+        backend.moderate.side_effect = BackendError("down")
+        with mock.patch.object(
+                moderation, "get_moderation_backend", return_value=backend
+        ):
+            for number in range(10):
+                self.assertTrue(moderation.block_decision(f"text {number}"))
+        self.assertEqual(
+            backend.moderate.call_count,
+            moderation_breaker.failure_threshold
+        )
+
+    @override_settings(REPLY_MAX_ATTEMPTS=3)
+    def test_long_replies_are_requested_a_bounded_number_of_times(self):
+        backend = mock.Mock()
+        backend.reply.return_value = "a" * 300
+        with mock.patch.object(
+                moderation, "get_reply_backend", return_value=backend
+        ):
+            self.assertIsNone(moderation.response_to_comment("post", "hi"))
+        self.assertEqual(backend.reply.call_count, 3)
+
+
+class BackendStatsTestCase(TestCase):
+    def setUp(self):
+        moderation_breaker.reset()
+        self.addCleanup(moderation_breaker.reset)
+
+    def get_stats(self, is_staff):
+        user = get_user_model().objects.create_user(
+            username="testuser", password="password", is_staff=is_staff
+        )
+        access = AccessToken.for_user(user)
+        return self.client.get(
+            "/api/backends/stats", HTTP_AUTHORIZATION=f"Bearer {access}"
+        )
+
+    def test_staff_see_breaker_metrics(self):
+        moderation_breaker.record_retry()
+        response = self.get_stats(is_staff=True)
+        self.assertEqual(response.status_code, 200)
+        moderation = response.json()["breakers"]["moderation"]
+        self.assertEqual(moderation["state"], "closed")
+        self.assertEqual(moderation["retries"], 1)
+
+    def test_other_users_are_refused(self):
+        self.assertEqual(self.get_stats(is_staff=False).status_code, 403)
@@ -0,0 +1,251 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings
+)
+from django.utils import timezone
+
+from comment.models import (
+    Comment,
+    ScheduledReply
+)
+from core.models import ModerationStatus
+from integrations.tasks import (
+    moderate_comment,
+    moderate_post,
+    reply_due_at,
+    send_due_replies,
+    send_reply
+)
+from post.models import Post
+
+User = get_user_model()
+
+
+class ModerationTasksTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            title="Test Post", text="Test Content", author=self.user,
+            moderation_status=ModerationStatus.PENDING
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.user, text="Test Comment",
+            moderation_status=ModerationStatus.PENDING
+        )
+
+    @mock.patch("integrations.tasks.block_decision", return_value=True)
+    def test_moderate_comment(self, block_decision):
+        moderate_comment(self.comment.id)
+        self.comment.refresh_from_db()
+        block_decision.assert_called_once_with("Test Comment")
+        self.assertTrue(self.comment.is_blocked)
+        self.assertEqual(
+            self.comment.moderation_status, ModerationStatus.MODERATED
+        )
+
+    @mock.patch("integrations.tasks.block_decision", return_value=False)
+    def test_moderate_post(self, block_decision):
+        moderate_post(self.post.id)
+        self.post.refresh_from_db()
+        block_decision.assert_called_once_with("Test PostTest Content")
+        self.assertFalse(self.post.is_blocked)
+        self.assertEqual(
+            self.post.moderation_status, ModerationStatus.MODERATED
+        )
+
+    @mock.patch("integrations.tasks.block_decision")
+    def test_moderate_deleted_comment(self, block_decision):
+        comment_id = self.comment.id
+        self.comment.delete()
+        moderate_comment(comment_id)
+        block_decision.assert_not_called()
+
+
+@mock.patch(
+    "integrations.tasks.response_to_comment",
+    return_value="Thanks for the comment"
+)
+class SendDueRepliesTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password="password"
+        )
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            title="Test Post", text="Test Content", author=self.author
+        )
+
+    def schedule(self, text, delay):
+        comment = Comment.objects.create(
+            post=self.post, author=self.user, text=text
+        )
+        ScheduledReply.objects.create(
+            comment=comment, due_at=timezone.now() + delay
+        )
+        return comment
+
+    @override_settings(REPLY_SWEEP_BATCH_SIZE=2)
+    def test_replies_to_due_comments(self, response_to_comment):
+        due = [
+            self.schedule(f"Due comment {number}", timedelta(minutes=-1))
+            for number in range(3)
+        ]
+        later = self.schedule("Later comment", timedelta(minutes=5))
+
+        send_due_replies()
+
+        self.assertEqual(response_to_comment.call_count, 3)
+        for comment in due:
+            reply = comment.replies.get()
+            self.assertEqual(reply.author, self.author)
+            self.assertEqual(reply.path, comment.children_path)
+        self.assertEqual(
+            list(ScheduledReply.objects.values_list("comment_id", flat=True)),
+            [later.id]
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 7)
+
+    @override_settings(REPLY_SEND_ATTEMPTS=2, REPLY_RETRY_DELAY=60)
+    def test_failed_reply_is_retried_later(self, response_to_comment):
+        response_to_comment.return_value = None
+        comment = self.schedule("Due comment", timedelta(minutes=-1))
+
+        send_due_replies()
+
+        self.assertFalse(comment.replies.exists())
+        scheduled = ScheduledReply.objects.get()
+        self.assertEqual(scheduled.attempts, 1)
+        self.assertIsNone(scheduled.claimed_until)
+        self.assertGreater(
+            scheduled.due_at, timezone.now() + timedelta(seconds=50)
+        )
+
+        # Due again, the backend is still down on the last attempt
+        ScheduledReply.objects.update(due_at=timezone.now())
+        send_due_replies()
+        self.assertFalse(ScheduledReply.objects.exists())
+        self.assertEqual(response_to_comment.call_count, 2)
+
+    def test_reply_after_outage(self, response_to_comment):
+        response_to_comment.return_value = None
+        comment = self.schedule("Due comment", timedelta(minutes=-1))
+        send_due_replies()
+
+        response_to_comment.return_value = "Thanks for the comment"
+        ScheduledReply.objects.update(due_at=timezone.now())
+        send_due_replies()
+
+        self.assertEqual(comment.replies.count(), 1)
+        self.assertFalse(ScheduledReply.objects.exists())
+
+    def test_leased_rows_are_skipped(self, response_to_comment):
+        comment = self.schedule("Due comment", timedelta(minutes=-1))
+        ScheduledReply.objects.update(
+            claimed_until=timezone.now() + timedelta(minutes=5)
+        )
+
+        send_due_replies()
+
+        response_to_comment.assert_not_called()
+        self.assertTrue(ScheduledReply.objects.exists())
+
+        # The sweep holding the lease died, the next one takes over
+        ScheduledReply.objects.update(
+            claimed_until=timezone.now() - timedelta(minutes=1)
+        )
+        send_due_replies()
+        self.assertEqual(comment.replies.count(), 1)
+
+    def test_reply_of_a_reclaimed_row_is_sent_once(self, response_to_comment):
+        comment = self.schedule("Due comment", timedelta(minutes=-1))
+        scheduled = ScheduledReply.objects.get()
+
+        send_reply(scheduled, "First reply")
+        send_reply(scheduled, "Second reply")
+
+        self.assertEqual(
+            list(comment.replies.values_list("text", flat=True)),
+            ["First reply"]
+        )
+
+    @override_settings(
+        REPLY_COALESCE_ENABLED=True, REPLY_COALESCE_MAX_PER_POST=2
+    )
+    @mock.patch("integrations.tasks.responses_to_comments")
+    def test_coalesces_replies_per_post(
+            self, responses_to_comments, response_to_comment
+    ):
+        responses_to_comments.side_effect = lambda post_text, texts: [
+            f"Reply to {text}" for text in texts
+        ]
+        due_at = timezone.now() - timedelta(minutes=1)
+        comments = [
+            Comment.objects.create(
+                post=self.post, author=self.user, text=f"Comment {number}"
+            )
+            for number in range(3)
+        ]
+        ScheduledReply.objects.bulk_create([
+            ScheduledReply(comment=comment, due_at=due_at)
+            for comment in comments
+        ])
+
+        send_due_replies()
+
+        responses_to_comments.assert_called_once_with(
+            "Test Content", ["Comment 0", "Comment 1"]
+        )
+        response_to_comment.assert_not_called()
+        self.assertEqual(
+            [comment.replies.count() for comment in comments], [1, 1, 0]
+        )
+        self.assertFalse(ScheduledReply.objects.exists())
+
+    @override_settings(
+        REPLY_COALESCE_ENABLED=True, REPLY_COALESCE_MAX_PER_POST=2
+    )
+    @mock.patch("integrations.tasks.responses_to_comments")
+    def test_cap_counts_earlier_replies(
+            self, responses_to_comments, response_to_comment
+    ):
+        responses_to_comments.side_effect = lambda post_text, texts: [
+            f"Reply to {text}" for text in texts
+        ]
+        answered = Comment.objects.create(
+            post=self.post, author=self.user, text="Answered comment"
+        )
+        # Sent by an earlier sweep of the same window
+        Comment.objects.create(
+            post=self.post, author=self.author, text="Earlier reply",
+            parent=answered
+        )
+        first = self.schedule("Comment 0", timedelta(minutes=-1))
+        second = self.schedule("Comment 1", timedelta(minutes=-1))
+
+        send_due_replies()
+
+        responses_to_comments.assert_called_once_with(
+            "Test Content", ["Comment 0"]
+        )
+        self.assertEqual(first.replies.count(), 1)
+        self.assertFalse(second.replies.exists())
+        self.assertFalse(ScheduledReply.objects.exists())
+
+    @override_settings(REPLY_COALESCE_ENABLED=True, REPLY_COALESCE_WINDOW=60)
+    def test_due_times_share_window(self, response_to_comment):
+        minute = timezone.now().replace(second=0, microsecond=0)
+        reply_time = timedelta(minutes=5)
+        due_at = {
+            reply_due_at(minute + timedelta(seconds=seconds), reply_time)
+            for seconds in (1, 30, 59.5, 60)
+        }
+        self.assertEqual(due_at, {minute + reply_time + timedelta(minutes=1)})
@@ -0,0 +1,29 @@
+import os
+
+from django.http import HttpRequest
+from ninja import Router
+from ninja.errors import HttpError
+from ninja_extra import status
+
+from integrations import resilience
+from user.authentication import StatelessJWTAuth
+
+router = Router()
+
+
+@router.get(
+    "/stats",
+    response={200: dict, 403: str},
+    auth=StatelessJWTAuth()
+)
+def backend_stats(request: HttpRequest) -> dict:
+    """
+    State and counters of the circuit breakers of the process serving
+    the request, they are kept per process
+    """
+    if not request.user.is_staff:
+        raise HttpError(
+            status.HTTP_403_FORBIDDEN,
+            "You do not have permission to view backend stats"
+        )
+    return {"pid": os.getpid(), "breakers": resilience.metrics()}
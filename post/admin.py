@@ -11,13 +11,12 @@ class CommentInline(admin.TabularInline):
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = (
-        "title", "author", "created_at", "reply_on_comments", "is_blocked"
+        "title", "author", "created_at", "reply_on_comments", "is_blocked",
+        "comment_count", "blocked_comment_count", "last_comment_at"
     )
     search_fields = ("title", "author__username", "text")
     list_filter = ("is_blocked", "created_at")
+    readonly_fields = (
+        "comment_count", "blocked_comment_count", "last_comment_at"
+    )
     inlines = [CommentInline]
-
-    def comments(self, obj):
-        return obj.comments.count()
-
-    comments.short_description = "Comments"
@@ -8,6 +8,10 @@ from django.http import HttpRequest
 from ninja.errors import HttpError
 from ninja_extra import status
 
+from core.decorators import (
+    Check,
+    resolve_object
+)
 from post.models import Post
 
 
@@ -17,9 +21,9 @@ def post_exist(func):
             request: HttpRequest,
             post_id: int, *args, **kwargs
     ) -> Any:
-        try:
-            Post.objects.get(id=post_id)
-        except Post.DoesNotExist:
+        if not Post.objects.visible_to(request.user).filter(
+                id=post_id
+        ).exists():
             raise HttpError(
                 status.HTTP_404_NOT_FOUND,
                 "Post not found"
@@ -28,33 +32,32 @@ def post_exist(func):
     return wrapper
 
 
-def has_edit_access(func: Callable):
-    @wraps(func)
-    def wrapper(
-            request: HttpRequest,
-            post_id: int, *args, **kwargs
-    ) -> Any:
-        post = Post.objects.get(id=post_id)
-        if not post.author == request.user:
-            raise HttpError(
-                status.HTTP_403_FORBIDDEN,
-                "You do not have permission to do edit this post"
-            )
-        return func(request, post_id, *args, **kwargs)
-    return wrapper
-
-
-def has_delete_access(func: Callable):
-    @wraps(func)
-    def wrapper(
-            request: HttpRequest,
-            post_id: int, *args, **kwargs
-    ) -> Any:
-        post = Post.objects.get(id=post_id)
-        if not (request.user.is_staff or post.author == request.user):
-            raise HttpError(
-                status.HTTP_403_FORBIDDEN,
-                "You do not have permission to do delete this post"
-            )
-        return func(request, post_id, *args, **kwargs)
-    return wrapper
+def resolve_post(
+        *select_related: str, check: Check | None = None,
+        visible: bool = False
+) -> Callable:
+    """
+    Load the post of the ``post_id`` path parameter once, check access
+    to it and pass it to the view as ``post``. With ``visible`` posts
+    awaiting moderation are only found by their author.
+    """
+    return resolve_object(
+        Post, "post_id", "post", "Post not found",
+        select_related=select_related, check=check, visible=visible
+    )
+
+
+def has_edit_access(request: HttpRequest, post: Post) -> None:
+    if not post.author_id == request.user.id:
+        raise HttpError(
+            status.HTTP_403_FORBIDDEN,
+            "You do not have permission to do edit this post"
+        )
+
+
+def has_delete_access(request: HttpRequest, post: Post) -> None:
+    if not (request.user.is_staff or post.author_id == request.user.id):
+        raise HttpError(
+            status.HTTP_403_FORBIDDEN,
+            "You do not have permission to do delete this post"
+        )
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:02
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model("post", "Post")
+    Comment = apps.get_model("comment", "Comment")
+    stats = Comment.objects.filter(post_id=OuterRef("id")).order_by().values("post_id")
+    Post.objects.update(
+        comment_count=Coalesce(
+            Subquery(stats.annotate(total=Count("id")).values("total")), 0
+        ),
+        blocked_comment_count=Coalesce(
+            Subquery(
+                stats.annotate(total=Count("id", filter=Q(is_blocked=True))).values(
+                    "total"
+                )
+            ),
+            0,
+        ),
+        last_comment_at=Subquery(stats.annotate(last=Max("created_at")).values("last")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0009_post_moderation_status"),
+        ("comment", "0006_comment_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="blocked_comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="last_comment_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,11 @@ from datetime import timedelta
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from core.models import (
+    ModeratedQuerySet,
+    ModerationStatus
+)
+
 User = get_user_model()
 
 
@@ -13,12 +18,31 @@ class Post(models.Model):
     title = models.CharField(max_length=255)
     text = models.TextField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also moved by comment.signals on any change to the post's comments
+    updated_at = models.DateTimeField(auto_now=True)
     reply_on_comments = models.BooleanField(default=True)
     reply_time = models.DurationField(default=timedelta(minutes=5))
     is_blocked = models.BooleanField(default=False)
+    moderation_status = models.CharField(
+        max_length=16,
+        choices=ModerationStatus.choices,
+        default=ModerationStatus.MODERATED
+    )
+    # Maintained by comment.signals, fixed by reconcile_post_counters
+    comment_count = models.PositiveIntegerField(default=0)
+    blocked_comment_count = models.PositiveIntegerField(default=0)
+    last_comment_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ModeratedQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # The feed, paged by (created_at, id)
+            models.Index(
+                fields=["-created_at", "-id"], name="post_feed_idx"
+            ),
+        ]
 
     @property
     def comments(self):
@@ -8,6 +8,7 @@ from ninja import (
     Field
 )
 from comment.schemas import CommentSchema
+from post.models import Post
 from user.schemas import UserSchema
 
 
@@ -23,8 +24,18 @@ class PostSchema(BasePostSchema):
     author: UserSchema
     created_at: datetime
     is_blocked: bool
+    moderation_status: str
+    comment_count: int
+    last_comment_at: Optional[datetime]
     comments: list[CommentSchema] = []
 
+    @staticmethod
+    def resolve_comments(post) -> list:
+        if isinstance(post, Post):
+            # Views attach the comment tree visible to the reader
+            return []
+        return post.comments
+
 
 class CreatePostSchema(BasePostSchema):
     pass
@@ -0,0 +1,18 @@
+from django.db.models.signals import (
+    post_delete,
+    post_save
+)
+from django.dispatch import receiver
+
+from core.cache import (
+    FEED_SCOPE,
+    POST_SCOPE,
+    invalidate
+)
+from post.models import Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_reads(sender, instance: Post, **kwargs) -> None:
+    invalidate(FEED_SCOPE, POST_SCOPE.format(post_id=instance.id))
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from ninja_jwt.tokens import AccessToken
+
+from comment.models import Comment
+from post.models import Post
+
+User = get_user_model()
+
+
+class ConditionalReadTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="Test Content"
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.user, text="Root Comment"
+        )
+        self.post_url = f"/api/posts/{self.post.id}"
+        self.comments_url = f"/api/comments/post/{self.post.id}"
+
+    def test_unchanged_post_is_not_modified(self):
+        etag = self.client.get(self.post_url)["ETag"]
+
+        # Only the version lookup, no post or tree query
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.post_url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_unchanged_comments_are_not_modified(self):
+        etag = self.client.get(self.comments_url)["ETag"]
+        response = self.client.get(
+            self.comments_url, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_reply_changes_etag(self):
+        etag = self.client.get(self.post_url)["ETag"]
+        Comment.objects.create(
+            post=self.post, author=self.user, text="Reply Comment",
+            parent=self.comment
+        )
+
+        response = self.client.get(self.post_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_comment_edit_changes_etag(self):
+        etag = self.client.get(self.comments_url)["ETag"]
+        self.comment.text = "Edited Comment"
+        self.comment.save()
+
+        response = self.client.get(
+            self.comments_url, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_edit_changes_etag(self):
+        etag = self.client.get(self.post_url)["ETag"]
+        self.post.title = "Edited Post"
+        self.post.save()
+
+        response = self.client.get(self.post_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_page_and_reader(self):
+        anonymous = self.client.get(self.comments_url)["ETag"]
+        second_page = self.client.get(self.comments_url, {"page": 2})
+        access = AccessToken.for_user(self.user)
+        authenticated = self.client.get(
+            self.comments_url, HTTP_AUTHORIZATION=f"Bearer {access}"
+        )
+        self.assertNotEqual(second_page["ETag"], anonymous)
+        self.assertNotEqual(authenticated["ETag"], anonymous)
+
+    def test_missing_post_has_no_etag(self):
+        response = self.client.get("/api/posts/999")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
@@ -0,0 +1,63 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from comment.models import Comment
+from integrations.tasks import moderate_comment
+from post.models import Post
+
+User = get_user_model()
+
+
+class PostCountersTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            title="Test Post", text="Test Content", author=self.user
+        )
+
+    def create_comment(self, **kwargs):
+        return Comment.objects.create(
+            post=self.post, author=self.user, text="Test Comment", **kwargs
+        )
+
+    def assertCounters(self, comments, blocked, last_comment_at):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, comments)
+        self.assertEqual(self.post.blocked_comment_count, blocked)
+        self.assertEqual(self.post.last_comment_at, last_comment_at)
+
+    def test_counters_follow_comments(self):
+        first = self.create_comment()
+        second = self.create_comment(is_blocked=True, parent=first)
+        self.assertCounters(2, 1, second.created_at)
+
+        second.delete()
+        self.assertCounters(1, 0, first.created_at)
+
+        first.delete()
+        self.assertCounters(0, 0, None)
+
+    @mock.patch("integrations.tasks.block_decision", return_value=True)
+    def test_moderation_updates_blocked_counter(self, block_decision):
+        comment = self.create_comment()
+        moderate_comment(comment.id)
+        moderate_comment(comment.id)
+        self.assertCounters(1, 1, comment.created_at)
+
+    def test_subtree_delete(self):
+        root = self.create_comment()
+        self.create_comment(parent=root, is_blocked=True)
+        Comment.objects.subtree(root).delete()
+        self.assertCounters(0, 0, None)
+
+    def test_reconcile_post_counters(self):
+        comment = self.create_comment(is_blocked=True)
+        Post.objects.update(comment_count=7, blocked_comment_count=0)
+        call_command("reconcile_post_counters", stdout=StringIO())
+        self.assertCounters(1, 1, comment.created_at)
@@ -5,6 +5,8 @@ from django.test import (
 )
 from django.contrib.auth import get_user_model
 import post.models as models
+from comment.models import Comment
+from core.models import ModerationStatus
 from ninja_jwt.tokens import AccessToken
 
 User = get_user_model()
@@ -35,6 +37,34 @@ class PostTestCase(TestCase):
         response = self.client.get("/api/posts/")
         self.assertEqual(response.status_code, 200)
 
+    def test_get_posts_pages_in_sql(self):
+        posts = [
+            models.Post.objects.create(
+                author=self.user, title=f"Post {number}", text="Content"
+            )
+            for number in range(6)
+        ]
+        parent = Comment.objects.create(
+            post=posts[0], author=self.user, text="Root Comment"
+        )
+        Comment.objects.create(
+            post=posts[0], author=self.other_user, text="Reply Comment",
+            parent=parent
+        )
+
+        # Count, the page of posts and the comments of that page only
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/posts/", {"page": 2})
+        self.assertEqual(response.json()["count"], 7)
+        items = response.json()["items"]
+        self.assertEqual(
+            [item["id"] for item in items], [posts[0].id, self.post.id]
+        )
+        self.assertEqual(
+            items[0]["comments"][0]["replies"][0]["author"]["username"],
+            "otheruser"
+        )
+
     def test_create_post_without_auto_replay(self):
         self.authenticate()
         time = timedelta(hours=1)
@@ -131,3 +161,14 @@ class PostTestCase(TestCase):
         self.authenticate(self.other_user)
         response = self.client.delete(f"/api/posts/{self.post.id}")
         self.assertEqual(response.status_code, 403)
+
+    def test_get_pending_post_of_other_user(self):
+        self.post.moderation_status = ModerationStatus.PENDING
+        self.post.save()
+
+        response = self.client.get(f"/api/posts/{self.post.id}")
+        self.assertEqual(response.status_code, 404)
+
+        self.authenticate()
+        response = self.client.get(f"/api/posts/{self.post.id}")
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from ninja_jwt.tokens import AccessToken
+
+from post.models import Post
+
+User = get_user_model()
+
+
+class PostQueryCountTestCase(TestCase):
+    """Each access check reuses the post the view works on"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="Test Content"
+        )
+        self.url = f"/api/posts/{self.post.id}"
+        access = AccessToken.for_user(self.user)
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {access}"
+
+    def test_edit_post(self):
+        # User, post with its author, update
+        with self.assertNumQueries(3):
+            response = self.client.patch(
+                self.url, {"title": "Updated Title"},
+                content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["author"]["id"], self.user.id)
+
+    def test_toggle_auto_reply(self):
+        with self.assertNumQueries(3):
+            response = self.client.patch(f"{self.url}/toggle")
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete_post(self):
+        # User, post, then the cascade: comments, their daily stats,
+        # the post itself
+        with self.assertNumQueries(5):
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_forbidden_edit_stops_after_lookup(self):
+        other_user = User.objects.create_user(
+            username="otheruser", password="password"
+        )
+        access = AccessToken.for_user(other_user)
+        with self.assertNumQueries(2):
+            response = self.client.patch(
+                self.url, {"title": "Updated Title"},
+                content_type="application/json",
+                HTTP_AUTHORIZATION=f"Bearer {access}"
+            )
+        self.assertEqual(response.status_code, 403)
+
+    def test_missing_post(self):
+        with self.assertNumQueries(2):
+            response = self.client.delete("/api/posts/999")
+        self.assertEqual(response.status_code, 404)
@@ -1,81 +1,132 @@
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
 from django.http import HttpRequest
 from ninja import Router
+from ninja.decorators import decorate_view
+from ninja.errors import HttpError
 from ninja.responses import Response
-from ninja.pagination import (
-    paginate,
-    PageNumberPagination
-)
 from ninja_extra import status
-from ninja_jwt.authentication import JWTAuth
 
-from integrations.gemini import block_decision
-from social_service.settings import PAGE_PAGINATION_NUMBER
+from comment.models import Comment
+from comment.tree import (
+    comment_rows,
+    load_comment_rows
+)
+from core.cache import (
+    FEED_SCOPE,
+    POST_SCOPE,
+    cached_response
+)
+from core.models import ModerationStatus
+from core.pagination import list_pagination
+from integrations.moderation import ablock_decision
+from integrations.tasks import moderate_post
+from social_service.settings import (
+    ASYNC_MODERATION,
+    PAGE_PAGINATION_NUMBER
+)
+from post.conditional import conditional_post_read
 from post.decorators import (
-    post_exist,
     has_delete_access,
-    has_edit_access
+    has_edit_access,
+    resolve_post
 )
 from post.models import Post
 import post.schemas as schemas
+from user.authentication import (
+    AsyncStatelessJWTAuth,
+    OptionalJWTAuth,
+    StatelessJWTAuth
+)
 
 router = Router()
 
 
-@router.get("", response=list[schemas.PostSchema])
-@paginate(PageNumberPagination, page_size=PAGE_PAGINATION_NUMBER)
-def get_posts(request: HttpRequest) -> list[schemas.PostSchema]:
-    posts = Post.objects.prefetch_related(
-        "comments__replies", "author"
-    )
-    post_schemas = []
+def with_comment_trees(
+        request: HttpRequest, posts: list[Post]
+) -> list[schemas.PostSchema]:
+    """Attach visible comment trees to a page of posts in one query"""
+    rows_by_post = defaultdict(list)
+    comments = Comment.objects.filter(post__in=posts).visible_to(request.user)
+    for row in comment_rows(comments, "post_id"):
+        rows_by_post[row["post_id"]].append(row)
 
+    post_schemas = []
     for post in posts:
         post_schema = schemas.PostSchema.from_orm(post)
         post_schema.comments = schemas.CommentSchema.build_comment_hierarchy(
-            post.comments.all()
+            rows_by_post[post.id]
         )
         post_schemas.append(post_schema)
 
     return post_schemas
 
 
+@router.get(
+    "", response=list[schemas.PostSchema], auth=OptionalJWTAuth()
+)
+@decorate_view(cached_response(FEED_SCOPE))
+@list_pagination(PAGE_PAGINATION_NUMBER, hydrate=with_comment_trees)
+def get_posts(request: HttpRequest) -> QuerySet[Post]:
+    return Post.objects.visible_to(request.user).select_related(
+        "author"
+    ).order_by("-created_at", "-id")
+
+
 @router.post(
     "",
     response={200: schemas.PostSchema, 400: str},
-    auth=JWTAuth()
+    auth=AsyncStatelessJWTAuth()
 )
-def create_post(
+async def create_post(
         request: HttpRequest, payload: schemas.CreatePostSchema
 ) -> schemas.PostSchema:
-    decision = block_decision(payload.title + payload.text)
     post = Post(
         author=request.user,
         title=payload.title,
-        text=payload.text,
-        is_blocked=decision
+        text=payload.text
     )
+    if ASYNC_MODERATION:
+        post.moderation_status = ModerationStatus.PENDING
+    else:
+        post.is_blocked = await ablock_decision(
+            payload.title + payload.text
+        )
     if payload.reply_time:
         post.reply_time = payload.reply_time
     if payload.reply_on_comments:
         post.reply_on_comments = payload.reply_on_comments
 
-    post.save()
-    return schemas.PostSchema.from_orm(post)
+    await post.asave()
+
+    if ASYNC_MODERATION:
+        await sync_to_async(moderate_post.delay)(post.id)
+
+    return await sync_to_async(schemas.PostSchema.from_orm)(post)
 
 
 @router.get(
     "/{post_id}",
-    response={200: schemas.PostSchema, 404: str}
+    response={200: schemas.PostSchema, 404: str},
+    auth=OptionalJWTAuth()
 )
-@post_exist
+@decorate_view(conditional_post_read)
+@decorate_view(cached_response(POST_SCOPE))
 def get_post(request: HttpRequest, post_id: int) -> schemas.PostSchema:
-    post = Post.objects.prefetch_related(
-        "comments__replies", "author"
-    ).get(id=post_id)
+    post = Post.objects.visible_to(request.user).select_related(
+        "author"
+    ).filter(id=post_id).first()
+    if post is None:
+        raise HttpError(
+            status.HTTP_404_NOT_FOUND,
+            "Post not found"
+        )
 
     post_schema = schemas.PostSchema.from_orm(post)
     post_schema.comments = schemas.CommentSchema.build_comment_hierarchy(
-        post.comments.all()
+        load_comment_rows(request.user, post_id=post_id)
     )
 
     return post_schema
@@ -83,16 +134,14 @@ def get_post(request: HttpRequest, post_id: int) -> schemas.PostSchema:
 
 @router.patch(
     "/{post_id}",
-    response={200: schemas.PostSchema, 403: str, 404: str}, auth=JWTAuth()
+    response={200: schemas.PostSchema, 403: str, 404: str},
+    auth=StatelessJWTAuth()
 )
-@post_exist
-@has_edit_access
+@resolve_post("author", check=has_edit_access)
 def edit_post(
-        request: HttpRequest, post_id: int,
+        request: HttpRequest, post: Post,
         payload: schemas.UpdatePostSchema
 ) -> schemas.PostSchema:
-    post = Post.objects.get(id=post_id)
-
     if payload.title is not None:
         post.title = payload.title
     if payload.text is not None:
@@ -106,14 +155,12 @@ def edit_post(
 
 @router.patch(
     "/{post_id}/toggle",
-    response={200: schemas.PostSchema}, auth=JWTAuth()
+    response={200: schemas.PostSchema}, auth=StatelessJWTAuth()
 )
-@post_exist
-@has_edit_access
+@resolve_post("author", check=has_edit_access)
 def toggle_auto_replay(
-        request: HttpRequest, post_id: int
+        request: HttpRequest, post: Post
 ) -> schemas.PostSchema:
-    post = Post.objects.get(id=post_id)
     post.reply_on_comments = not post.reply_on_comments
 
     post.save()
@@ -122,12 +169,10 @@ def toggle_auto_replay(
 
 @router.delete(
     "/{post_id}",
-    response={200: str, 403: str, 404: str}, auth=JWTAuth()
+    response={200: str, 403: str, 404: str}, auth=StatelessJWTAuth()
 )
-@post_exist
-@has_delete_access
-def delete_post(request: HttpRequest, post_id: int) -> Response:
-    post = Post.objects.get(id=post_id)
+@resolve_post(check=has_delete_access)
+def delete_post(request: HttpRequest, post: Post) -> Response:
     post.delete()
     return Response(
         {"detail": "Post deleted successfully"},
@@ -1,6 +1,7 @@
 import os
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -36,6 +37,7 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "core.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -64,6 +66,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "social_service.wsgi.application"
+ASGI_APPLICATION = "social_service.asgi.application"
 
 
 USE_DOCKER = os.environ.get("RUNNING_IN_DOCKER", "False") == "True"
@@ -120,10 +123,166 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 NINJA_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_PAIR_INPUT_SCHEMA": (
+        "user.tokens.ClaimsTokenObtainPairInputSchema"
+    ),
+}
+
+STATELESS_JWT_AUTH = os.environ.get("STATELESS_JWT_AUTH", "False") == "True"
+
+JWT_USER_CACHE_SIZE = 10_000
+
+JWT_USER_CACHE_TTL = 60
+
+API_RENDERER = os.environ.get(
+    "API_RENDERER", "core.renderers.ORJSONRenderer"
+)
+
+API_PARSER = os.environ.get("API_PARSER", "core.renderers.ORJSONParser")
+
+REQUEST_METRICS_SAMPLE_RATE = float(
+    os.environ.get("REQUEST_METRICS_SAMPLE_RATE", 0)
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.metrics": {"handlers": ["console"], "level": "INFO"},
+    },
 }
 
 PAGE_PAGINATION_NUMBER = 5
 
 BREAKDOWN_PAGINATION_NUMBER = 10
 
+COMMENT_BULK_MAX_SIZE = 100
+
+CURSOR_PAGINATION = os.environ.get("CURSOR_PAGINATION", "False") == "True"
+
+RESPONSE_CACHE_REDIS_URL = os.environ.get("RESPONSE_CACHE_REDIS_URL")
+
+if RESPONSE_CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": RESPONSE_CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+RESPONSE_CACHE_ENABLED = (
+    os.environ.get("RESPONSE_CACHE_ENABLED", "False") == "True"
+)
+
+if RESPONSE_CACHE_ENABLED and not RESPONSE_CACHE_REDIS_URL:
+    # Celery workers retire cached responses too, which a cache in the
+    # memory of each process would never see
+    raise ImproperlyConfigured(
+        "RESPONSE_CACHE_ENABLED requires RESPONSE_CACHE_REDIS_URL"
+    )
+
+RESPONSE_CACHE_TTL = 60 * 5
+
+RESPONSE_CACHE_LOCK_TIMEOUT = 5
+
 CELERY_BROKER_URL = os.environ.get("CELERY_REDIS_BROKER_URL")
+
+REPLY_SWEEP_INTERVAL = 10
+
+REPLY_SWEEP_BATCH_SIZE = 100
+
+REPLY_SWEEP_LEASE = 60 * 15
+
+REPLY_SEND_ATTEMPTS = 5
+
+REPLY_RETRY_DELAY = 60 * 2
+
+REPLY_COALESCE_ENABLED = (
+    os.environ.get("REPLY_COALESCE_ENABLED", "False") == "True"
+)
+
+REPLY_COALESCE_WINDOW = 60
+
+REPLY_COALESCE_MAX_PER_POST = 20
+
+CELERY_BEAT_SCHEDULE = {
+    "send-due-replies": {
+        "task": "integrations.tasks.send_due_replies",
+        "schedule": REPLY_SWEEP_INTERVAL,
+    },
+}
+
+MODERATION_CACHE_SIZE = 10_000
+
+MODERATION_CACHE_TTL = 60 * 60 * 24
+
+MODERATION_CACHE_REDIS_URL = os.environ.get("MODERATION_CACHE_REDIS_URL")
+
+ASYNC_MODERATION = os.environ.get("ASYNC_MODERATION", "False") == "True"
+
+MODERATION_BATCH_ENABLED = (
+    os.environ.get("MODERATION_BATCH_ENABLED", "False") == "True"
+)
+
+MODERATION_BATCH_SIZE = 20
+
+MODERATION_BATCH_WINDOW = 0.05
+
+MODERATION_PREFILTER_ENABLED = (
+    os.environ.get("MODERATION_PREFILTER_ENABLED", "True") == "True"
+)
+
+MODERATION_BLOCKLIST_PATH = BASE_DIR / "integrations" / "wordlists" / "blocklist.txt"
+
+MODERATION_ALLOWLIST_PATH = BASE_DIR / "integrations" / "wordlists" / "allowlist.txt"
+
+MODERATION_PREFILTER_ALLOW_MAX_WORDS = 8
+
+MODERATION_BACKEND = os.environ.get(
+    "MODERATION_BACKEND",
+    "integrations.backends.gemini.GeminiModerationBackend"
+)
+
+REPLY_BACKEND = os.environ.get(
+    "REPLY_BACKEND",
+    "integrations.backends.gemini.GeminiReplyBackend"
+)
+
+GEMINI_SECRET_KEY = os.environ.get("GEMINI_SECRET_KEY")
+
+GEMINI_MODEL = "gemini-1.5-flash"
+
+FAKE_BACKEND_LATENCY = float(os.environ.get("FAKE_BACKEND_LATENCY", 0))
+
+FAKE_BACKEND_ERROR_RATE = float(os.environ.get("FAKE_BACKEND_ERROR_RATE", 0))
+
+FAKE_BACKEND_BLOCK_RATE = float(os.environ.get("FAKE_BACKEND_BLOCK_RATE", 0.1))
+
+BACKEND_TIMEOUT = 10
+
+BACKEND_DEADLINE = 20
+
+BACKEND_RETRIES = 2
+
+BACKEND_RETRY_BACKOFF = 0.5
+
+BACKEND_RETRY_MAX_BACKOFF = 4
+
+BACKEND_CIRCUIT_FAILURE_THRESHOLD = 5
+
+BACKEND_CIRCUIT_RESET_TIMEOUT = 30
+
+MODERATION_DEFAULT_VERDICT = (
+    os.environ.get("MODERATION_DEFAULT_VERDICT", "False") == "True"
+)
+
+REPLY_MAX_ATTEMPTS = 3
@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import (
+    AbstractUser,
+    AnonymousUser
+)
+from django.http import HttpRequest
+from django.utils.translation import gettext_lazy as _
+from ninja_extra.security import AsyncHttpBearer
+from ninja_jwt.authentication import (
+    AsyncJWTBaseAuthentication,
+    JWTAuth
+)
+from ninja_jwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken
+)
+from ninja_jwt.settings import api_settings
+from ninja_jwt.tokens import Token
+
+from core.lru import LRUCache
+from user.tokens import USER_CLAIMS
+
+user_cache = LRUCache(
+    settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL
+)
+
+# Whether the user of a token still exists and is active, for tokens
+# carrying the user claims
+active_user_cache = LRUCache(
+    settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL
+)
+
+
+class OptionalJWTAuth(JWTAuth):
+    """
+    Resolves the user from a valid bearer token,
+    but lets anonymous requests through to public endpoints.
+    """
+
+    def __call__(self, request: HttpRequest) -> object:
+        try:
+            user = super().__call__(request)
+        except (InvalidToken, AuthenticationFailed):
+            user = None
+        if not user:
+            request.user = AnonymousUser()
+            return request.user
+        return user
+
+
+class StatelessJWTAuth(JWTAuth):
+    """
+    With STATELESS_JWT_AUTH on, builds request.user from the claims of
+    the access token (see user.tokens) instead of loading it, so views
+    get ``id``, ``username`` and ``is_staff`` without a query. Only
+    whether the user still exists and is active is looked up, and kept
+    in an in-process cache for JWT_USER_CACHE_TTL seconds, so deleted
+    and deactivated users lose access within that time. Tokens minted
+    without the claims fall back to the full user, cached likewise.
+
+    The token user is an unsaved User instance: it can be assigned to
+    foreign keys, but must never be saved, endpoints changing the user
+    itself keep JWTAuth.
+    """
+
+    def get_user(self, validated_token: Token) -> AbstractUser:
+        if not settings.STATELESS_JWT_AUTH:
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if all(claim in validated_token for claim in USER_CLAIMS):
+            if not is_active_user(user_id):
+                raise AuthenticationFailed(
+                    _("User not found or inactive"), code="user_not_found"
+                )
+            user = get_user_model()(
+                id=user_id,
+                **{claim: validated_token[claim] for claim in USER_CLAIMS}
+            )
+            user._state.adding = False
+            return user
+
+        user = user_cache.get(str(user_id))
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(str(user_id), user)
+        return user
+
+
+def is_active_user(user_id: int) -> bool:
+    is_active = active_user_cache.get(str(user_id))
+    if is_active is None:
+        is_active = get_user_model().objects.filter(
+            id=user_id, is_active=True
+        ).exists()
+        active_user_cache.set(str(user_id), is_active)
+    return is_active
+
+
+class AsyncStatelessJWTAuth(
+    AsyncJWTBaseAuthentication, StatelessJWTAuth, AsyncHttpBearer
+):
+    async def authenticate(self, request: HttpRequest, token: str) -> object:
+        return await self.async_jwt_authenticate(request, token)
@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings
+)
+from ninja_jwt.tokens import (
+    AccessToken,
+    RefreshToken
+)
+
+from post.models import Post
+from user.authentication import (
+    active_user_cache,
+    user_cache
+)
+from user.tokens import token_for_user
+
+User = get_user_model()
+
+
+@override_settings(STATELESS_JWT_AUTH=True)
+class StatelessJWTAuthTestCase(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        active_user_cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="Test Post", text="Test Content"
+        )
+
+    def authenticate(self, access):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {access}"
+
+    def test_obtained_tokens_carry_user_claims(self):
+        response = self.client.post(
+            "/api/user/token/pair",
+            {"username": "testuser", "password": "password"},
+            content_type="application/json"
+        )
+        access = AccessToken(response.json()["access"])
+        self.assertEqual(access["username"], "testuser")
+        self.assertFalse(access["is_staff"])
+
+        refreshed = RefreshToken(response.json()["refresh"]).access_token
+        self.assertEqual(refreshed["username"], "testuser")
+
+    def test_token_user_needs_no_query(self):
+        self.authenticate(token_for_user(self.user).access_token)
+        # Only whether the user is still active, then cached
+        with self.assertNumQueries(1):
+            self.client.get("/api/user/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/user/")
+        self.assertEqual(response.json(), {
+            "id": self.user.id, "username": "testuser", "is_staff": False
+        })
+
+    def test_write_with_token_user(self):
+        self.authenticate(token_for_user(self.user).access_token)
+        self.client.get("/api/user/")
+        # Post with its author and the update, no user lookup
+        with self.assertNumQueries(2):
+            response = self.client.patch(
+                f"/api/posts/{self.post.id}", {"title": "Updated Title"},
+                content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    @mock.patch("comment.views.ablock_decision", return_value=False)
+    def test_async_write_with_token_user(self, block_decision):
+        self.authenticate(token_for_user(self.user).access_token)
+        response = self.client.post(
+            f"/api/comments/create/{self.post.id}",
+            {"text": "New Comment"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["author"]["username"], "testuser")
+        self.assertEqual(self.post.comments.get().author, self.user)
+
+    def test_staff_claim_grants_delete(self):
+        admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        self.authenticate(token_for_user(admin).access_token)
+        response = self.client.delete(f"/api/posts/{self.post.id}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_user_is_rejected(self):
+        access = token_for_user(self.user).access_token
+        self.user.delete()
+        self.authenticate(access)
+        response = self.client.post(
+            "/api/posts/", {"title": "Title", "text": "Text"},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        access = token_for_user(self.user).access_token
+        self.user.is_active = False
+        self.user.save()
+        self.authenticate(access)
+        response = self.client.get("/api/user/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_tokens_without_claims_use_cached_user(self):
+        self.authenticate(AccessToken.for_user(self.user))
+        with self.assertNumQueries(1):
+            self.client.get("/api/user/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/user/")
+        self.assertEqual(response.json()["username"], "testuser")
+
+    @override_settings(STATELESS_JWT_AUTH=False)
+    def test_disabled_mode_loads_user(self):
+        self.authenticate(token_for_user(self.user).access_token)
+        with self.assertNumQueries(1):
+            self.client.get("/api/user/")
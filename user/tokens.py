@@ -0,0 +1,26 @@
+from typing import Dict
+
+from django.contrib.auth.models import AbstractUser
+from ninja_jwt.schema import TokenObtainPairInputSchema
+from ninja_jwt.tokens import RefreshToken
+
+# Claims StatelessJWTAuth builds request.user from, besides the user id
+USER_CLAIMS = ("username", "is_staff")
+
+
+def token_for_user(user: AbstractUser) -> RefreshToken:
+    """Refresh token carrying the user claims, copied to its access tokens"""
+    refresh = RefreshToken.for_user(user)
+    for claim in USER_CLAIMS:
+        refresh[claim] = getattr(user, claim)
+    return refresh
+
+
+class ClaimsTokenObtainPairInputSchema(TokenObtainPairInputSchema):
+    @classmethod
+    def get_token(cls, user: AbstractUser) -> Dict:
+        refresh = token_for_user(user)
+        return {
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+        }
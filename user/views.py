@@ -14,11 +14,12 @@ from user.decorators import (
     username_availability
 )
 import user.schemas as schemas
+from user.authentication import StatelessJWTAuth
 
 router = Router()
 
 
-@router.get("", response=schemas.UserSchema, auth=JWTAuth())
+@router.get("", response=schemas.UserSchema, auth=StatelessJWTAuth())
 def get_user(request: HttpRequest) -> schemas.UserSchema:
     return schemas.UserSchema.from_orm(request.user)
 